@@ -5,7 +5,12 @@ import pandas as pd
 import os
 from datetime import datetime, date
 import time
-from difflib import get_close_matches
+from hotdeal_store import open_store, ConflictError, MASTER_COLS, NOTICE_COLS, display_frame, format_won, extract_num, format_korean_unit
+from hotdeal_index import SearchIndex, FuzzyMatcher, PriceAggregate, SortIndex, take
+from hotdeal_sim import read_plan, PLAN_COLS, MATCH_RULES
+from hotdeal_import import final_price, read_feed, prepare_feed, unregistered, FeedSpool, BRAND_DICT, FEED_COLS
+from hotdeal_perf import StageTimer, TimingLog
+from hotdeal_engine import Engine, EngineClient
 
 # =================================================================
 # 📢 런칭 전 필수 설정
@@ -17,48 +22,83 @@ KAKAO_LINK = "https://open.kakao.com/o/gQshP8fi"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "hotdeal_master_db.csv")
 NOTICE_PATH = os.path.join(BASE_DIR, "hotdeal_notice_db.csv")
+ENGINE_URL = os.environ.get("HOTDEAL_ENGINE_URL", "")  # 설정 시 포털 검색/시뮬레이터를 조회 엔진(hotdeal_engine.py serve)에 맡긴다
 
 DISPLAY_COLS = ["플랫폼", "행사일정", "브랜드", "제품명", "정상가", "최종혜택가", "체감가", "사은품"]
+PAGE_SIZES = [50, 100, 200, 500]
+BATCH_ROWS = 1000  # 일괄 시뮬레이션 요청 한 번에 보내는 행 수 (진행률 표시 단위)
+PLATFORMS = ["지마켓", "옥션", "11번가", "쿠팡", "네이버", "SSG"]
+
+@st.cache_resource
+def get_store(path):
+    # 프로세스 전체에서 공유되는 저장소 (기본 SQLite WAL, HOTDEAL_BACKEND=csv 로 기존 CSV 직접 사용).
+    # 저장소 버전이 바뀐 경우에만 바뀐 행을 다시 읽는다.
+    return open_store(path, MASTER_COLS if "master" in path else NOTICE_COLS)
 
-def extract_num(val):
-    try:
-        if pd.isna(val) or val == "" or val is None: return 0.0
-        if isinstance(val, (int, float)): return float(val)
-        clean_val = "".join(filter(lambda x: x.isdigit() or x == '.', str(val)))
-        return float(clean_val) if clean_val else 0.0
-    except: return 0.0
-
-def format_korean_unit(num):
-    num = int(num)
-    if num == 0: return "0원"
-    if num >= 100000000:
-        return f"{num//100000000}억 {(num%100000000)//10000}만 {num%10000:,}원"
-    if num >= 10000:
-        return f"{num//10000}만 {num%10000:,}원"
-    return f"{num:,}원"
-
-@st.cache_data(ttl=1)
 def load_data(path):
-    is_master = "master" in path
-    if not os.path.exists(path):
-        if is_master: return pd.DataFrame(columns=["선택", "등록날짜", "카테고리"] + DISPLAY_COLS + ["표준모델명"])
-        return pd.DataFrame(columns=["선택", "날짜", "유형", "제목", "내용"])
-    df = pd.read_csv(path).fillna("")
-    if "선택" not in df.columns: df.insert(0, "선택", False)
-    df["선택"] = df["선택"].astype(bool)
-    if is_master and "표준모델명" not in df.columns:
-        df["표준모델명"] = df["제품명"] if "제품명" in df.columns else ""
-    return df
-
-BRAND_DICT = {
-    "디지털/가전": ["삼성전자", "LG전자", "애플", "소니", "다이슨", "샤오미", "필립스", "로지텍", "쿠쿠", "쿠첸"],
-    "가공식품": ["CJ제일제당", "오뚜기", "농심", "동원F&B", "대상(청정원)", "풀무원", "삼양식품", "팔도", "매일유업", "빙그레"],
-    "신선식품": ["하림", "목우촌", "팜스코", "선진포크", "본죽", "한우한돈", "우리수산", "프레시지", "마켓컬리"],
-    "건강기능식품": ["정관장", "종근당건강", "뉴트리원", "에스더포뮬러", "고려은단", "세노비스", "안국건강", "락토핏"],
-    "생활/리빙": ["유한양행", "피앤지", "LG생활건강", "애경", "깨끗한나라", "한샘", "모던하우스", "다이소", "테팔"],
-    "패션/잡화": ["나이키", "아디다스", "뉴발란스", "노스페이스", "구찌", "프라다", "지오다노", "무신사스탠다드", "크록스"],
-    "뷰티": ["아모레퍼시픽", "올리브영", "설화수", "닥터자르트", "이니스프리", "랑콤", "에스티로더", "헤라", "넘버즈인"]
-}
+    return get_store(path).snapshot()
+
+def editor_base(name, store, sig, build):
+    # 편집기에 넘길 행을 세션에 고정해 둔다 (조회 조건이 바뀌거나 저장/새로고침 후에만 다시 만든다).
+    # 저장 시 이 행과 당시 저장소 버전을 기준으로 바뀐 행만 반영하고 충돌을 검사한다.
+    # 편집 중인 내용이 없을 때는 다른 곳의 변경(신규 등록 등)도 바로 반영한다.
+    ss = st.session_state
+    pending = ss.get(f"{name}_{ss.get(f'{name}_gen', 0)}") or {}
+    dirty = any(pending.get(k) for k in ("edited_rows", "added_rows", "deleted_rows"))
+    if ss.get(f"{name}_sig") != sig or f"{name}_base" not in ss or (ss[f"{name}_ver"] != store.version and not dirty):
+        ss[f"{name}_sig"], ss[f"{name}_base"], ss[f"{name}_ver"] = sig, build(), store.version
+        ss[f"{name}_gen"] = ss.get(f"{name}_gen", 0) + 1
+    return ss[f"{name}_base"], ss[f"{name}_ver"], f"{name}_{ss[f'{name}_gen']}"
+
+def save_editor(name, store, edited, deleted=()):
+    # 편집기 변경분 저장. 성공하면 (수정 건수, 삭제 건수), 충돌이면 오류를 보여주고 None
+    ss = st.session_state
+    try:
+        with timer("저장"): res = store.save_edits(ss[f"{name}_base"], edited, deleted, ss[f"{name}_ver"])
+    except ConflictError as e:
+        st.error(f"{e} 🔄 새로고침 후 다시 수정해 주세요.")
+        return None
+    ss.pop(f"{name}_sig", None)
+    return res
+
+@st.cache_resource
+def get_search_index():
+    # 마스터 DB 의 등록/수정/삭제를 구독해 증분 갱신되는 검색 인덱스
+    idx = SearchIndex()
+    get_store(DB_PATH).subscribe(idx.on_change)
+    return idx
+
+@st.cache_resource
+def get_fuzzy_matcher():
+    # 표준모델명 유사 검색기 (get_close_matches 와 동일 결과, 신규 모델명은 증분 추가)
+    fm = FuzzyMatcher()
+    get_store(DB_PATH).subscribe(fm.on_change)
+    return fm
+
+@st.cache_resource
+def get_price_aggregate():
+    # 표준모델명별 최저가/건수/최근 행사일 집계 (시뮬레이터 판정, 역대 최저 배지)
+    agg = PriceAggregate()
+    get_store(DB_PATH).subscribe(agg.on_change)
+    return agg
+
+@st.cache_resource
+def get_sort_index():
+    # 행사 시작일/최종혜택가 기준으로 미리 정렬된 행 순서 (검색 결과 페이지 조회용)
+    si = SortIndex()
+    get_store(DB_PATH).subscribe(si.on_change)
+    return si
+
+@st.cache_resource
+def get_engine():
+    # 포털 조회 창구: HOTDEAL_ENGINE_URL 이 있으면 상주 조회 엔진의 HTTP 클라이언트, 없으면 이 프로세스의 인덱스를 쓰는 로컬 엔진
+    if ENGINE_URL: return EngineClient(ENGINE_URL)
+    return Engine(get_store(DB_PATH), get_search_index(), get_sort_index(), get_price_aggregate(), get_fuzzy_matcher())
+
+@st.cache_resource
+def get_timing_log():
+    # 모든 세션의 단계별 소요 시간 (관리자 화면의 ⏱️ 패널, 로그 "hotdeal.perf")
+    return TimingLog()
 
 # [2] 페이지 설정 (사이드바 기본 닫힘 유지)
 st.set_page_config(page_title="HOTDEAL STRATEGY HUB", layout="wide", initial_sidebar_state="collapsed")
@@ -81,8 +121,9 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-db = load_data(DB_PATH)
-ndb = load_data(NOTICE_PATH)
+timer = StageTimer(get_timing_log())
+with timer("로드"):
+    ndb = load_data(NOTICE_PATH)
 
 if 'authenticated' not in st.session_state: st.session_state.authenticated = False
 if 'prod_val' not in st.session_state: st.session_state.prod_val = ""
@@ -124,28 +165,42 @@ if menu == "🏠 MD 포털":
 
     st.divider()
     st.markdown('<div class="group-title">🔍 핫딜 데이터 조회 및 분석</div>', unsafe_allow_html=True)
-    p_list = ["전체"] + sorted([str(p) for p in db["플랫폼"].unique().tolist() if str(p).strip() != ""]) if not db.empty else ["전체"]
+    eng = get_engine()
+    try: p_list = ["전체"] + eng.platforms()
+    except ValueError as e: p_list = ["전체"]; st.error(str(e))
     cq, cp, cs1, cs2 = st.columns([2, 1, 1, 1], gap="small")
     search_q = cq.text_input("브랜드/제품명/모델명 검색", value="", placeholder="검색어를 입력하세요", key="p_q_v55")
     pf_f = cp.selectbox("플랫폼 필터", p_list, key="p_p_v55")
     s_by = cs1.selectbox("정렬 기준", ["📅 행사일정순", "💰 최종혜택가순"], key="p_s_v55")
     s_or = cs2.selectbox("정렬 순서", ["⬇️ 내림차순", "⬆️ 오름차순"], key="p_o_v55")
 
-    if (search_q.strip() or pf_f != "전체") and not db.empty:
-        res = db.copy()
-        if search_q: res = res[res["브랜드"].str.contains(search_q, case=False) | res["제품명"].str.contains(search_q, case=False) | res["표준모델명"].str.contains(search_q, case=False)]
-        if pf_f != "전체": res = res[res["플랫폼"] == pf_f]
+    if search_q.strip() or pf_f != "전체":
+        # 화면에는 현재 페이지 행만 받아 온다. 검색 조건이 바뀌면 첫 페이지로
+        if st.session_state.get("p_sig_v55") != (search_q, pf_f, s_by, s_or): st.session_state.p_pg_v55 = 1
+        st.session_state.p_sig_v55 = (search_q, pf_f, s_by, s_or)
+        try:
+            with timer("검색"):
+                found = eng.search(search_q, None if pf_f == "전체" else pf_f, "date" if "행사일정" in s_by else "price",
+                                   "asc" if "오름차순" in s_or else "desc", st.session_state.get("p_pg_v55", 1), st.session_state.get("p_ps_v55", PAGE_SIZES[0]))
+        except ValueError as e: found = None; st.error(str(e))
         
-        if not res.empty:
-            res["_tf"] = res["최종혜택가"].apply(extract_num); res["_te"] = res["체감가"].apply(extract_num)
-            min_f, min_e = int(res["_tf"].min()), int(res["_te"].min())
-            st.markdown(f'''<div class="unified-banner">💡 <b>"{search_q if search_q else pf_f}" 검색 결과:</b> 최종 최저 <span class="accent-price">{min_f:,}원</span> | ✨ 체감 최저 <span class="accent-price">{min_e:,}원</span> <span class="guide-mention">🔍 상세 사은품 구성을 꼭 확인하세요!</span></div>''', unsafe_allow_html=True)
-            is_a = True if "오름차순" in s_or else False
-            if "행사일정" in s_by:
-                res["_td"] = res["행사일정"].str.split(" ~ ").str[0]; res = res.sort_values(by="_td", ascending=is_a)
-            else: res = res.sort_values(by="_tf", ascending=is_a)
-            st.dataframe(res[DISPLAY_COLS], use_container_width=True, hide_index=True)
-        else:
+        if found and found["total"]:
+            st.markdown(f'''<div class="unified-banner">💡 <b>"{search_q if search_q else pf_f}" 검색 결과:</b> 최종 최저 <span class="accent-price">{found["min_final"]:,}원</span> | ✨ 체감 최저 <span class="accent-price">{found["min_felt"]:,}원</span> <span class="guide-mention">🔍 상세 사은품 구성을 꼭 확인하세요!</span></div>''', unsafe_allow_html=True)
+            pg1, pg2, pg3 = st.columns([1, 1, 2])
+            pg1.selectbox("페이지당 행 수", PAGE_SIZES, key="p_ps_v55")
+            pages = found["pages"]
+            if st.session_state.get("p_pg_v55", 1) > pages: st.session_state.p_pg_v55 = 1
+            p_no = pg2.number_input("페이지", min_value=1, max_value=pages, step=1, key="p_pg_v55")
+            pg3.markdown(f'<div class="kakao-container">총 {found["total"]:,}건 · {found["page"]}/{pages} 페이지</div>', unsafe_allow_html=True)
+            res = found["rows"]
+            view = display_frame(res[DISPLAY_COLS])
+            view.insert(0, "역대최저", res["역대최저"].map({True: "🏆", False: ""}))
+            st.dataframe(view, use_container_width=True, hide_index=True)
+            with st.expander("📊 플랫폼별 요약"):
+                summ = found["summary"]
+                summ["최저"], summ["중앙값"] = format_won(summ["최저"].astype(int)), format_won(summ["중앙값"].astype(int))
+                st.dataframe(summ, use_container_width=True, hide_index=True)
+        elif found is not None:
             st.warning("검색 결과가 없습니다.")
     else:
         st.markdown('<div class="empty-guide"><i class="fa-solid fa-magnifying-glass"></i> 검색어를 입력하시면 상세 데이터가 나타납니다.</div>', unsafe_allow_html=True)
@@ -161,26 +216,19 @@ if menu == "🏠 MD 포털":
         s_f = st.text_input("예상 체감가(원)", value="", key="sim_f_v55")
         if s_f and extract_num(s_f) > 0: st.markdown(f'<div class="smart-viewer">✨ {format_korean_unit(extract_num(s_f))}</div>', unsafe_allow_html=True)
 
-    if s_name and not db.empty:
-        input_p, input_f = extract_num(s_p), extract_num(s_f)
-        sim_res = db[db["표준모델명"].str.contains(s_name, case=False) | db["제품명"].str.contains(s_name, case=False)].copy()
-        
-        if not sim_res.empty:
-            sim_res["_f_val"] = sim_res["최종혜택가"].apply(extract_num)
-            sim_res["_e_val"] = sim_res["체감가"].apply(extract_num)
-            h_min_f = int(sim_res["_f_val"].min())
-            h_min_e = int(sim_res[sim_res["_e_val"] > 0]["_e_val"].min()) if not sim_res[sim_res["_e_val"] > 0].empty else h_min_f
-            
-            st.markdown(f'''<div class="unified-banner">🔎 <b>"{s_name}"</b> 과거 기록: 최종혜택 최저 <span class="accent-price">{h_min_f:,}원</span> | ✨ 체감 최저 <span class="accent-price">{h_min_e:,}원</span></div>''', unsafe_allow_html=True)
-            
-            def get_judgment(current, historic):
-                if current <= 0: return None
-                if current < historic: return ("🔥 핫딜 무조건 진행해보죠!", "success")
-                elif current <= historic * 1.1: return ("👍 핫딜 해볼까요? (10% 내외)", "info")
-                elif current <= historic * 1.2: return ("🤔 핫딜 조금 어렵지 않을까요? (20% 내외)", "warning")
-                else: return ("❌ 핫딜 안될 거 같아요!", "error")
-
-            res_p, res_f = get_judgment(input_p, h_min_f), get_judgment(input_f, h_min_e)
+    if s_name:
+        try:
+            with timer("시뮬레이션"): sim = eng.simulate(s_name, s_p, s_f)
+        except ValueError as e: sim = {"history": None}; st.error(str(e))
+        hist = sim["history"]
+
+        if hist:
+            h_min_f, h_min_e = hist["min_final"], hist["min_felt"]
+            recent = f' | 📅 최근 {sim["window_days"]}일 최저 <span class="accent-price">{hist["recent_min_final"]:,}원</span>' if hist.get("recent_min_final") is not None else ""
+            matched = f' ({sim["method"]} 매칭: {sim["model"]})' if sim.get("method") not in (None, "정확") else ""
+            st.markdown(f'''<div class="unified-banner">🔎 <b>"{s_name}"</b>{matched} 과거 기록: 최종혜택 최저 <span class="accent-price">{h_min_f:,}원</span> | ✨ 체감 최저 <span class="accent-price">{h_min_e:,}원</span>{recent}</div>''', unsafe_allow_html=True)
+
+            res_p, res_f = sim["final"], sim["felt"]
             jc1, jc2 = st.columns(2)
             if res_p:
                 with jc1:
@@ -200,16 +248,41 @@ if menu == "🏠 MD 포털":
     else:
         st.markdown('<div class="empty-guide"><i class="fa-solid fa-magnifying-glass-chart"></i> 분석하실 품목을 입력하시면 핫딜 가능 여부에 대한 데이터가 나타납니다.</div>', unsafe_allow_html=True)
 
+    with st.expander("📑 행사 계획 일괄 시뮬레이션 (CSV 업로드 / 표 붙여넣기)"):
+        st.caption(f"컬럼 순서: {', '.join(PLAN_COLS)} · 엑셀에서 복사해 그대로 붙여넣어도 됩니다.")
+        st.caption("과거 기록은 단건 시뮬레이터와 같은 순서로 찾습니다 (매칭방식): " + " → ".join(f"{k}({v})" for k, v in MATCH_RULES.items()))
+        b_file = st.file_uploader("계획 CSV 업로드", type=["csv", "txt"], key="sim_b_file")
+        b_text = st.text_area("또는 표 붙여넣기", key="sim_b_text", height=120)
+        if st.button("🚀 일괄 판정", use_container_width=True, key="sim_b_run"):
+            try: plan = read_plan(b_file.getvalue() if b_file else b_text)
+            except (ValueError, pd.errors.ParserError, pd.errors.EmptyDataError) as e: plan = None; st.error(f"계획 표를 읽을 수 없습니다: {e}")
+            if plan is not None and plan.empty: st.warning("판정할 행이 없습니다.")
+            elif plan is not None:
+                bar, parts = st.progress(0.0, text="판정 중..."), []
+                try:
+                    with timer("일괄 시뮬레이션"):
+                        for start in range(0, len(plan), BATCH_ROWS):
+                            parts.append(eng.simulate_plan(plan.iloc[start:start + BATCH_ROWS]))
+                            done = min(start + BATCH_ROWS, len(plan)); bar.progress(done / len(plan), text=f"판정 중... {done:,}/{len(plan):,}")
+                    st.session_state.batch_res = pd.concat(parts)
+                except ValueError as e: st.error(str(e))
+                bar.empty()
+        b_res = st.session_state.get("batch_res")
+        if b_res is not None:
+            st.dataframe(b_res, use_container_width=True, hide_index=True)
+            st.download_button("📥 판정 결과 다운로드", b_res.to_csv(index=False).encode("utf-8-sig"), file_name="hotdeal_plan_result.csv", mime="text/csv", use_container_width=True)
+
 # [6] 🔐 관리자 통합 센터
 elif menu == "🔐 관리자 통합 센터" and st.session_state.authenticated:
     st.title("🔐 관리자 시스템")
-    t1, t2, t3 = st.tabs(["✨ 핫딜 등록", "📝 데이터 수정/삭제", "📢 게시물 관리"])
+    with timer("로드"): db = load_data(DB_PATH)
+    t1, t_bulk, t2, t3 = st.tabs(["✨ 핫딜 등록", "📦 피드 일괄 등록", "📝 데이터 수정/삭제", "📢 게시물 관리"])
     
     with t1:
         st.markdown('<div class="group-title">📂 카테고리/플랫폼 설정</div>', unsafe_allow_html=True)
         cat = st.selectbox("카테고리 선택", list(BRAND_DICT.keys()), key="ad_cat")
         cp1, cp2 = st.columns(2)
-        pf_s = cp1.selectbox("플랫폼 선택", ["지마켓", "옥션", "11번가", "쿠팡", "네이버", "SSG"], key="ad_pfs")
+        pf_s = cp1.selectbox("플랫폼 선택", PLATFORMS, key="ad_pfs")
         pf_m = cp2.text_input("플랫폼 직접 입력", key="ad_pfm")
         st.markdown('<div class="group-title">🏷️ 제품 정보 및 매칭</div>', unsafe_allow_html=True)
         cb1, cb2 = st.columns(2)
@@ -218,8 +291,7 @@ elif menu == "🔐 관리자 통합 센터" and st.session_state.authenticated:
         prod = st.text_input("제품명 입력", value=st.session_state.prod_val, key="ad_prod")
         std = prod
         if prod and not db.empty:
-            all_m = db["표준모델명"].unique().tolist()
-            matches = get_close_matches(prod, all_m, n=5, cutoff=0.2)
+            with timer("유사 모델 매칭"): matches = get_fuzzy_matcher().close_matches(prod, n=5, cutoff=0.2)
             if matches:
                 st.markdown('<span style="color:#1c7ed6; font-size:0.9em; font-weight:800;">💡 유사 모델 발견 (클릭 시 자동 완성)</span>', unsafe_allow_html=True)
                 m_cols = st.columns(len(matches))
@@ -245,12 +317,7 @@ elif menu == "🔐 관리자 통합 센터" and st.session_state.authenticated:
         gift = st.text_area("🎁 사은품 구성", key="ad_gift")
         
         p_v = extract_num(p_raw)
-        d_coupon = cov if cot=="원" else p_v*(cov/100)
-        d_card = cav if cat_unit=="원" else p_v*(cav/100)
-        d_ex1 = ex1v if ex1t=="원" else p_v*(ex1v/100)
-        d_ex2 = ex2v if ex2t=="원" else p_v*(ex2v/100)
-        
-        auto_f = int(p_v - d_coupon - d_card - d_ex1 - d_ex2)
+        auto_f = int(final_price(p_v, [(cov, cot), (cav, cat_unit), (ex1v, ex1t), (ex2v, ex2t)]))
         st.info(f"📋 자동 계산 혜택가 (쿠폰+카드+기타1,2 반영): {auto_f:,}원")
         
         feel_i = st.text_input("✨ 최종 체감가 (원)", value="", key="ad_fee")
@@ -261,33 +328,96 @@ elif menu == "🔐 관리자 통합 센터" and st.session_state.authenticated:
             else:
                 f_pf, f_br = pf_m if pf_m.strip() else pf_s, br_m if br_m.strip() else br_s
                 dr = f"{ev_date[0]} ~ {ev_date[1]}" if len(ev_date)==2 else str(ev_date[0])
-                new = pd.DataFrame([{"선택":False,"등록날짜":datetime.now().strftime("%Y-%m-%d"),"카테고리":cat,"플랫폼":f_pf,"브랜드":f_br,"제품명":prod,"표준모델명":std,"정상가":f"{int(p_v):,}원","행사일정":dr,"최종혜택가":f"{int(auto_f):,}원","체감가":f"{int(extract_num(feel_i)):,}원","사은품":gift}])
-                pd.concat([db, new], ignore_index=True).to_csv(DB_PATH, index=False, encoding="utf-8-sig")
-                st.session_state.prod_val = ""; st.success("등록 완료!"); time.sleep(1); st.cache_data.clear(); st.rerun()
+                new = pd.DataFrame([{"선택":False,"등록날짜":datetime.now().strftime("%Y-%m-%d"),"카테고리":cat,"플랫폼":f_pf,"브랜드":f_br,"제품명":prod,"표준모델명":std,"정상가":int(p_v),"행사일정":dr,"최종혜택가":int(auto_f),"체감가":int(extract_num(feel_i)),"사은품":gift}])
+                with timer("등록"): get_store(DB_PATH).append(new)
+                st.session_state.prod_val = ""; st.success("등록 완료!"); time.sleep(1); st.rerun()
+
+    with t_bulk:
+        st.markdown('<div class="group-title">📦 플랫폼 피드 파일 일괄 등록</div>', unsafe_allow_html=True)
+        st.caption(f"인식 컬럼: {', '.join(FEED_COLS)} · 할인 값에 %를 붙이거나 단위 컬럼에 %를 넣으면 정상가 대비 비율로 계산합니다.")
+        bk_file = st.file_uploader("피드 파일 (CSV / Excel)", type=["csv", "txt", "xlsx"], key="bk_file")
+        bk1, bk2, bk3 = st.columns(3)
+        bk_pf = bk1.selectbox("기본 플랫폼 (파일에 없을 때)", PLATFORMS, key="bk_pf")
+        bk_cat = bk2.selectbox("기본 카테고리 (브랜드로 추정 불가 시)", list(BRAND_DICT.keys()), key="bk_cat")
+        bk_date = bk3.date_input("기본 행사 일정", [date.today(), date.today()], key="bk_date")
+        if bk_file and st.button("🔍 피드 검증", use_container_width=True, key="bk_check"):
+            defaults = {"플랫폼": bk_pf, "카테고리": bk_cat, "등록날짜": datetime.now().strftime("%Y-%m-%d"),
+                        "행사일정": f"{bk_date[0]} ~ {bk_date[-1]}" if len(bk_date) else f"{date.today()} ~ {date.today()}"}
+            if st.session_state.get("bk_spool") is not None: st.session_state.bk_spool.close()
+            bar, spool = st.progress(0.0, text="피드 읽는 중..."), FeedSpool()
+            st.session_state.bk_spool = None
+            try:
+                # 검증한 행은 청크별로 임시 파일에 쌓고 미리보기만 메모리에 둔다
+                with timer("피드 검증"):
+                    bk_file.seek(0)
+                    for frac, read, rows, skip in prepare_feed(read_feed(bk_file, bk_file.name), db, BRAND_DICT, get_price_aggregate(), get_fuzzy_matcher(), defaults):
+                        spool.add(rows, skip)
+                        bar.progress(frac, text=f"피드 처리 중... {read:,}행")
+                st.session_state.bk_spool = spool
+            except (ValueError, pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+                spool.close()
+                st.error(f"피드를 읽을 수 없습니다: {e}")
+            bar.empty()
+        spool = st.session_state.get("bk_spool")
+        if spool is not None:
+            st.info(f"📋 신규 {spool.rows:,}건 · 중복/제품명 누락으로 제외 {spool.skipped:,}건")
+            if spool.rows:
+                st.caption(f"미리보기: 앞 {len(spool.preview):,}건")
+                st.dataframe(display_frame(spool.preview.drop(columns=["_식별모델"]).rename(columns={"_매칭방식": "매칭방식"})), use_container_width=True, hide_index=True)
+                if st.button(f"🚀 {spool.rows:,}건 일괄 등록", use_container_width=True, type="primary", key="bk_commit"):
+                    bar, done = st.progress(0.0, text="데이터베이스에 저장 중..."), [0]
+                    def tracked(chunks):
+                        for rows in chunks:
+                            yield rows
+                            done[0] += len(rows)
+                            bar.progress(done[0] / spool.rows, text=f"데이터베이스에 저장 중... {done[0]:,}/{spool.rows:,}건")
+                    # 전체 청크를 한 번의 쓰기로 저장 (도중에 실패하면 아무것도 저장되지 않아 다시 눌러도 중복이 생기지 않음)
+                    with timer("일괄 등록"):
+                        store = get_store(DB_PATH)
+                        added = store.append_chunks(unregistered(tracked(spool.chunks()), store.snapshot()))
+                    spool.close(); st.session_state.bk_spool = None
+                    st.success(f"일괄 등록 완료! {added:,}건" + (f" (검증 이후 먼저 등록된 {spool.rows - added:,}건 제외)" if added < spool.rows else "")); time.sleep(1); st.rerun()
 
     with t2:
-        # [수정 사항] 데이터 수정/삭제 직관성 강화
+        # [수정 사항] 데이터 수정/삭제 직관성 강화 - 조건/페이지 단위로 불러와 바뀐 행만 저장
         if not db.empty:
             st.write("💡 표 안의 내용을 클릭하여 직접 수정한 후 아래 **수정 내용 저장** 버튼을 눌러주세요.")
-            ed = st.data_editor(db, use_container_width=True, hide_index=True, key="ad_editor")
+            ef1, ef2, ef3, ef4 = st.columns([2, 1, 1, 1])
+            e_q = ef1.text_input("검색 (브랜드/제품명/모델명)", key="ad_q")
+            e_pf = ef2.selectbox("플랫폼", ["전체"] + get_search_index().platforms(), key="ad_pf")
+            e_ids = get_search_index().search(e_q, None if e_pf == "전체" else e_pf)[::-1]  # 최근 등록 순
+            e_size = ef3.selectbox("페이지당 행 수", PAGE_SIZES, key="ad_ps")
+            if st.session_state.get("ad_fsig") != (e_q, e_pf, e_size): st.session_state.ad_pg = 1
+            st.session_state.ad_fsig = (e_q, e_pf, e_size)
+            e_pages = max(1, -(-len(e_ids) // e_size))
+            if st.session_state.get("ad_pg", 1) > e_pages: st.session_state.ad_pg = 1
+            e_no = ef4.number_input("페이지", min_value=1, max_value=e_pages, step=1, key="ad_pg")
+            st.caption(f"총 {len(e_ids):,}건 · {e_no}/{e_pages} 페이지")
+            base, _, ed_key = editor_base("ad_ed", get_store(DB_PATH), (e_q, e_pf, e_size, e_no),
+                                          lambda: take(db, e_ids[(e_no - 1) * e_size:e_no * e_size]))
+            ed = st.data_editor(base, use_container_width=True, hide_index=True, key=ed_key, column_order=[c for c in base.columns if not c.startswith("_")])
             
-            mc1, mc2 = st.columns(2)
+            mc1, mc2, mc3 = st.columns([2, 2, 1])
             with mc1:
                 # '저장' 대신 '수정 내용 저장'으로 변경하여 역할 명시
                 if st.button("💾 수정 내용 저장", use_container_width=True, type="primary"): 
-                    ed.to_csv(DB_PATH, index=False, encoding="utf-8-sig")
-                    st.cache_data.clear()
-                    st.success("데이터가 성공적으로 수정되었습니다.")
-                    time.sleep(1)
-                    st.rerun()
+                    res = save_editor("ad_ed", get_store(DB_PATH), ed)
+                    if res is not None:
+                        st.success(f"데이터가 성공적으로 수정되었습니다. ({res[0]:,}건)")
+                        time.sleep(1)
+                        st.rerun()
             with mc2:
-                # 삭제 기능 유지
+                # 삭제 기능 유지 (같은 페이지의 수정 내용도 함께 저장)
                 if st.button("🗑️ 선택 항목 삭제", use_container_width=True): 
-                    ed[ed["선택"]==False].to_csv(DB_PATH, index=False, encoding="utf-8-sig")
-                    st.cache_data.clear()
-                    st.warning("선택된 항목이 삭제되었습니다.")
-                    time.sleep(1)
-                    st.rerun()
+                    res = save_editor("ad_ed", get_store(DB_PATH), ed, ed.index[ed["선택"] == True])
+                    if res is not None:
+                        st.warning(f"선택된 항목이 삭제되었습니다. ({res[1]:,}건)")
+                        time.sleep(1)
+                        st.rerun()
+            with mc3:
+                if st.button("🔄 새로고침", use_container_width=True, key="ad_reload"):
+                    st.session_state.pop("ad_ed_sig", None); st.rerun()
+            st.download_button("📥 CSV 내보내기", get_store(DB_PATH).export_csv, file_name="hotdeal_master_db.csv", mime="text/csv", use_container_width=True)
         else:
             st.info("데이터베이스에 등록된 상품이 없습니다.")
 
@@ -298,28 +428,30 @@ elif menu == "🔐 관리자 통합 센터" and st.session_state.authenticated:
             if st.form_submit_button("📝 등록"):
                 if tit and cont:
                     new_n = pd.DataFrame([{"선택":False,"날짜":date.today().strftime("%Y-%m-%d"),"유형":nt,"제목":tit,"내용":cont}])
-                    pd.concat([ndb, new_n], ignore_index=True).to_csv(NOTICE_PATH, index=False, encoding="utf-8-sig")
-                    st.success("등록 완료!"); st.cache_data.clear(); st.rerun()
+                    get_store(NOTICE_PATH).append(new_n)
+                    st.success("등록 완료!"); st.rerun()
         
         st.markdown('<div class="group-title">📝 기존 게시물 관리 (수정/삭제)</div>', unsafe_allow_html=True)
         if not ndb.empty:
             f_type = st.selectbox("관리할 유형 선택", ["전체", "공지사항", "업데이트"])
-            manage_df = ndb.copy()
-            if f_type != "전체": manage_df = manage_df[manage_df["유형"] == f_type]
-            ed_ndb = st.data_editor(manage_df, use_container_width=True, hide_index=True, key="ndb_editor")
+            manage_df, _, nd_key = editor_base("nd_ed", get_store(NOTICE_PATH), f_type,
+                                               lambda: ndb if f_type == "전체" else ndb[ndb["유형"] == f_type])
+            ed_ndb = st.data_editor(manage_df, use_container_width=True, hide_index=True, key=nd_key)
             ec1, ec2 = st.columns(2)
             if ec1.button("💾 게시물 수정 저장", use_container_width=True):
-                if f_type == "전체": ed_ndb.to_csv(NOTICE_PATH, index=False, encoding="utf-8-sig")
-                else:
-                    other_df = ndb[ndb["유형"] != f_type]
-                    pd.concat([other_df, ed_ndb], ignore_index=True).to_csv(NOTICE_PATH, index=False, encoding="utf-8-sig")
-                st.success("수정 내용이 저장되었습니다."); st.cache_data.clear(); st.rerun()
+                if save_editor("nd_ed", get_store(NOTICE_PATH), ed_ndb) is not None:
+                    st.success("수정 내용이 저장되었습니다."); st.rerun()
             if ec2.button("🗑️ 선택 게시물 삭제", use_container_width=True):
-                final_ndb = ed_ndb[ed_ndb["선택"] == False]
-                if f_type != "전체":
-                    other_df = ndb[ndb["유형"] != f_type]
-                    final_ndb = pd.concat([other_df, final_ndb], ignore_index=True)
-                final_ndb.to_csv(NOTICE_PATH, index=False, encoding="utf-8-sig")
-                st.success("삭제 완료!"); st.cache_data.clear(); st.rerun()
+                if save_editor("nd_ed", get_store(NOTICE_PATH), ed_ndb, ed_ndb.index[ed_ndb["선택"] == True]) is not None:
+                    st.success("삭제 완료!"); st.rerun()
         else:
-            st.info("등록된 게시물이 없습니다.")
\ No newline at end of file
+            st.info("등록된 게시물이 없습니다.")
+
+# [7] ⏱️ 단계별 소요 시간 (관리자 전용)
+timer.finish()
+if st.session_state.authenticated and st.sidebar.checkbox("⏱️ 단계별 소요 시간", key="perf_on"):
+    with st.sidebar:
+        st.caption("이번 화면 (ms)")
+        st.dataframe(timer.frame(), use_container_width=True, hide_index=True)
+        st.caption("최근 누적 (ms, p95 순)")
+        st.dataframe(get_timing_log().summary(), use_container_width=True, hide_index=True)
\ No newline at end of file
@@ -0,0 +1,214 @@
+# 헤드리스 벤치마크 - 합성 데이터(한국어 상품/브랜드/플랫폼) 생성 후 로드/검색/시뮬레이션/유사 매칭/등록/저장 지연시간과 피크 메모리 측정
+#   python hotdeal_bench.py gen 100000 --out hotdeal_master_db.csv
+#   python hotdeal_bench.py run --rows 10000 100000 1000000 [--backend sqlite|csv] [--repeat 3] [--out 결과.csv]
+
+import argparse
+import gc
+import itertools
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from hotdeal_import import BRAND_DICT
+from hotdeal_index import SearchIndex, FuzzyMatcher, PriceAggregate, SortIndex, take, search_deals, page_ids
+from hotdeal_sim import get_judgment, match_history, simulate_plan, PLAN_COLS
+from hotdeal_store import open_store, MASTER_COLS
+
+SIZES = [10_000, 100_000, 1_000_000]
+PLATFORMS = ["지마켓", "옥션", "11번가", "쿠팡", "네이버", "SSG", "롯데온", "카카오톡딜"]
+# 카테고리별 (품목, 정상가 하한, 상한)
+PRODUCTS = {
+    "디지털/가전": (["냉장고", "세탁기", "건조기", "TV", "노트북", "무선이어폰", "청소기", "에어컨", "공기청정기", "전기밥솥", "모니터", "태블릿"], 50_000, 3_000_000),
+    "가공식품": (["컵라면", "즉석밥", "왕교자", "참치캔", "스팸", "포기김치", "3분카레", "감자칩", "멸균우유", "아이스크림"], 3_000, 60_000),
+    "신선식품": (["닭가슴살", "삼겹살", "한우 등심", "손질 고등어", "활전복", "밀키트", "샐러드", "무항생제 계란"], 5_000, 150_000),
+    "건강기능식품": (["홍삼정", "유산균", "비타민C", "오메가3", "루테인", "저분자 콜라겐", "멀티비타민"], 15_000, 300_000),
+    "생활/리빙": (["세탁세제", "섬유유연제", "3겹 화장지", "물티슈", "샴푸", "프라이팬", "수납장", "매트리스"], 5_000, 800_000),
+    "패션/잡화": (["운동화", "러닝화", "롱패딩", "후드티", "백팩", "슬리퍼", "크로스백"], 20_000, 1_500_000),
+    "뷰티": (["에센스", "수분크림", "선크림", "쿠션", "클렌징폼", "립스틱", "토너"], 10_000, 250_000),
+}
+SERIES = ["", "프로", "플러스", "울트라", "맥스", "라이트", "에디션", "미니", "2세대", "2026"]
+SIZE_OPTS = ["", "", "", "1+1", "대용량", "2개입", "기획세트", "30개입"]
+GIFTS = ["", "", "", "", "전용 파우치", "정품 필터 2개", "미니어처 3종", "추가 배터리", "쇼핑백", "샘플 5종", "보냉백"]
+PREFIXES = ["", "", "", "[단독] ", "[특가] ", "[한정수량] ", "(공식) "]
+
+
+def generate_rows(n, seed=0, models_per_row=0.125):
+    # 마스터 DB 스키마의 합성 행 n 개. 모델 하나당 평균 1/models_per_row 번 행사가 잡히도록 모델 풀을 만든다
+    rng = np.random.default_rng(seed)
+    cats = list(BRAND_DICT)
+    m = max(50, int(n * models_per_row))
+    m_cat = rng.integers(len(cats), size=m)
+    models, m_base, m_brand = [], np.empty(m), []
+    for i, c in enumerate(m_cat):
+        cat = cats[c]
+        words, lo, hi = PRODUCTS[cat]
+        brand = BRAND_DICT[cat][rng.integers(len(BRAND_DICT[cat]))]
+        code = f"{chr(65 + rng.integers(26))}{chr(65 + rng.integers(26))}-{rng.integers(100, 9999)}"
+        parts = [brand, words[rng.integers(len(words))], SERIES[rng.integers(len(SERIES))], SIZE_OPTS[rng.integers(len(SIZE_OPTS))], code]
+        models.append(" ".join(p for p in parts if p))
+        m_brand.append(brand)
+        m_base[i] = np.exp(rng.uniform(np.log(lo), np.log(hi)))
+    pick = rng.integers(m, size=n)
+    normal = (np.round(m_base[pick] * rng.uniform(0.95, 1.1, n), -2)).astype("int64")
+    final = (normal * (1 - rng.uniform(0.05, 0.45, n)) // 10 * 10).astype("int64")
+    gift = rng.integers(len(GIFTS), size=n)
+    felt = np.where(rng.random(n) < 0.3, 0, final - (final * rng.uniform(0.0, 0.1, n) * (gift >= 4)) // 10 * 10).astype("int64")
+    start = pd.Timestamp(date.today()) - pd.to_timedelta(rng.integers(0, 730, n), unit="D")
+    end = start + pd.to_timedelta(rng.integers(0, 15, n), unit="D")
+    std = np.array(models, dtype=object)[pick]
+    prefix = np.array(PREFIXES, dtype=object)[rng.integers(len(PREFIXES), size=n)]
+    return pd.DataFrame({
+        "선택": False,
+        "등록날짜": start.strftime("%Y-%m-%d"),
+        "카테고리": np.array(cats, dtype=object)[m_cat[pick]],
+        "플랫폼": np.array(PLATFORMS, dtype=object)[rng.integers(len(PLATFORMS), size=n)],
+        "행사일정": start.strftime("%Y-%m-%d") + " ~ " + end.strftime("%Y-%m-%d"),
+        "브랜드": np.array(m_brand, dtype=object)[pick],
+        "제품명": prefix + std,
+        "정상가": normal, "최종혜택가": final, "체감가": felt,
+        "사은품": np.array(GIFTS, dtype=object)[gift],
+        "표준모델명": std,
+    }, columns=MASTER_COLS)
+
+
+def write_csv(df, path):
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def measure(fn, repeat=3, mem=True):
+    # (호출별 초 목록, tracemalloc 피크 바이트). 시간은 추적 없이 재고, 메모리는 한 번 더 추적해 잰다.
+    # tracemalloc 은 파이썬/numpy 할당만 잡으므로 SQLite 내부 메모리는 포함되지 않는다.
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(); times.append(time.perf_counter() - t)
+    peak = None
+    if mem:
+        gc.collect(); tracemalloc.start()
+        try:
+            fn(); peak = tracemalloc.get_traced_memory()[1]
+        finally: tracemalloc.stop()
+    return times, peak
+
+
+def _perturb(name, rng):
+    # 유사 매칭용 질의: 글자 하나를 빼거나 공백을 없앤 모델명 (매 호출 다른 질의로 메모 캐시를 피한다)
+    i = rng.integers(len(name))
+    return name[:i] + name[i + 1:] if rng.random() < 0.5 else name.replace(" ", "")
+
+
+def bench_size(n, workdir, backend="sqlite", repeat=3, mem=True, seed=0, log=print):
+    # 한 데이터 크기에 대한 단계별 결과 행 목록
+    rng = np.random.default_rng(seed + 1)
+    d = os.path.join(workdir, str(n)); os.makedirs(d, exist_ok=True)
+    csv = os.path.join(d, "hotdeal_master_db.csv")
+    sqlite = os.path.join(d, "hotdeal.sqlite3")
+    rows, results = generate_rows(n, seed), []
+
+    def record(stage, fn, times=repeat, **kw):
+        t, peak = measure(fn, times, mem)
+        results.append({"행수": n, "단계": stage, "횟수": len(t), "중앙값(ms)": np.median(t) * 1000, "최대(ms)": max(t) * 1000,
+                        "피크(MB)": None if peak is None else peak / 2 ** 20, **kw})
+        log(f"  {n:>9,} {stage:<24} {np.median(t) * 1000:10.1f}ms" + ("" if peak is None else f" {peak / 2 ** 20:9.1f}MB"))
+
+    record("데이터 생성", lambda: generate_rows(n, seed), 1)
+    write_csv(rows, csv)
+
+    def cold_load():
+        for p in (sqlite, sqlite + "-wal", sqlite + "-shm"):
+            if os.path.exists(p): os.remove(p)
+        return open_store(csv, MASTER_COLS, backend, sqlite).snapshot()
+    record("로드 (최초/마이그레이션)", cold_load, 1)
+    record("로드 (재시작)", lambda: open_store(csv, MASTER_COLS, backend, sqlite).snapshot())
+    store = open_store(csv, MASTER_COLS, backend, sqlite)
+    db = store.snapshot()
+
+    built = []
+    for cls in (SearchIndex, FuzzyMatcher, PriceAggregate, SortIndex):
+        record(f"인덱스 구축 ({cls.__name__})", lambda: cls().on_change("reset", db), 1)
+        built.append(cls())
+        store.subscribe(built[-1].on_change)
+    s_idx, fm, agg, si = built
+
+    model = db["표준모델명"].iloc[len(db) // 2]
+    queries = {"브랜드": db["브랜드"].iloc[0], "2글자": model.split()[1][:2], "모델명 일부": " ".join(model.split()[:2]), "플랫폼만": ""}
+    for label, q in queries.items():
+        pf = PLATFORMS[0] if label == "플랫폼만" else None
+        def search(q=q, pf=pf):
+            ordered = search_deals(s_idx, si, q, pf, "_시작일", False)
+            res = take(db, page_ids(ordered, 50, 1))
+            return res["최종혜택가"] <= agg.lookup(res)
+        record(f"검색 ({label})", search, **{"결과 수": len(search_deals(s_idx, si, q, pf))})
+
+    record("시뮬레이션 (정확 일치)", lambda: get_judgment(100_000, match_history(model, db, agg, s_idx, fm)[2]["min_final"]))
+    record("시뮬레이션 (부분 일치)", lambda: match_history(" ".join(model.split()[1:3]), db, agg, s_idx, fm))
+    names = db["표준모델명"].sample(1000, replace=True, random_state=seed).tolist()
+    plan = pd.DataFrame({PLAN_COLS[0]: [_perturb(x, rng) if i % 4 == 0 else x for i, x in enumerate(names)], PLAN_COLS[1]: 100_000, PLAN_COLS[2]: 90_000})
+    def batch():
+        fm._memo.clear()
+        return [part for _, part in simulate_plan(plan, db, agg, s_idx, fm)]
+    record("일괄 시뮬레이션 (1,000행)", batch, 1)
+
+    fuzzy_q = itertools.cycle([_perturb(x, rng) for x in db["표준모델명"].sample(200, replace=True, random_state=seed + 2)])
+    record("유사 모델 매칭", lambda: fm.close_matches(next(fuzzy_q), n=5, cutoff=0.2), max(repeat, 10))
+
+    new = rows.head(1).copy()
+    record("등록 (1건)", lambda: store.append(new), max(repeat, 10))
+
+    tick = itertools.count()
+    def save():
+        cur = store.snapshot()
+        base, ver = take(cur, cur.index[:50]), store.version
+        ed = base.copy()
+        ed.loc[ed.index[:5], "사은품"] = f"벤치 수정 {next(tick)}"
+        return store.save_edits(base, ed, [], ver)
+    record("저장 (50행 중 5건 수정)", save, max(repeat, 10))
+    record("CSV 내보내기", store.export_csv)
+    return results
+
+
+def run_benchmark(sizes=SIZES, backend="sqlite", repeat=3, mem=True, workdir=None, seed=0, log=print):
+    tmp = workdir or tempfile.mkdtemp(prefix="hotdeal_bench_")
+    try:
+        results = []
+        for n in sizes: results += bench_size(n, tmp, backend, repeat, mem, seed, log)
+        return pd.DataFrame(results).round(2)
+    finally:
+        if workdir is None: shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _rows(v):
+    # 10k / 100k / 1m 같은 표기 허용
+    v = v.lower().replace(",", "").replace("_", "")
+    mult = {"k": 1_000, "m": 1_000_000}.get(v[-1], 1)
+    return int(float(v[:-1] if mult > 1 else v) * mult)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="핫딜 DB 합성 데이터 생성 / 벤치마크")
+    sub = ap.add_subparsers(dest="action", required=True)
+    g = sub.add_parser("gen", help="합성 마스터 DB CSV 생성")
+    g.add_argument("rows", type=_rows)
+    g.add_argument("--out", default="hotdeal_master_db.csv")
+    g.add_argument("--seed", type=int, default=0)
+    r = sub.add_parser("run", help="단계별 지연시간/피크 메모리 측정")
+    r.add_argument("--rows", type=_rows, nargs="+", default=SIZES)
+    r.add_argument("--backend", choices=["sqlite", "csv"], default="sqlite")
+    r.add_argument("--repeat", type=int, default=3)
+    r.add_argument("--no-mem", action="store_true", help="tracemalloc 피크 메모리 측정 생략")
+    r.add_argument("--workdir", help="생성한 데이터/DB 를 남겨 둘 디렉터리 (기본: 임시 디렉터리, 끝나면 삭제)")
+    r.add_argument("--seed", type=int, default=0)
+    r.add_argument("--out", help="결과를 CSV 로 저장")
+    a = ap.parse_args()
+    if a.action == "gen":
+        write_csv(generate_rows(a.rows, a.seed), a.out)
+        print(f"{a.out} 에 {a.rows:,}건을 만들었습니다.")
+    else:
+        res = run_benchmark(a.rows, a.backend, a.repeat, not a.no_mem, a.workdir, a.seed)
+        print(res.to_string(index=False))
+        if a.out: res.to_csv(a.out, index=False, encoding="utf-8-sig")
@@ -0,0 +1,387 @@
+# 조회 엔진 - 마스터 DB 와 인덱스를 메모리에 올려 둔 상주 프로세스 + 로컬 HTTP/JSON API (asyncio)
+#   python hotdeal_engine.py serve [--port 8765] [--workers 4]
+#   GET /health, /platforms, /search?q=&platform=&sort=date|price&order=desc|asc&page=1&size=50,
+#       /simulate?name=&final=&felt=, /lows?model=    POST /simulate/batch {"rows": [{제품명, 예상 최종혜택가, 예상 체감가}, ...]}
+# Streamlit 앱은 HOTDEAL_ENGINE_URL 이 설정되어 있으면 EngineClient 로 이 API 를 호출한다.
+
+import argparse
+import asyncio
+import json
+import mmap
+import multiprocessing
+import os
+import shutil
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from hotdeal_index import SearchIndex, FuzzyMatcher, PriceAggregate, SortIndex, take, gather, search_deals, page_ids, summarize
+from hotdeal_sim import get_judgment, match_history, simulate_plan, PLAN_COLS
+from hotdeal_store import open_store, file_columns, extract_num, MASTER_COLS
+
+DEFAULT_PORT = 8765
+MAX_PAGE_SIZE = 1000
+MAX_BODY = 16 * 2 ** 20  # 요청 본문 상한 (일괄 시뮬레이션)
+SNAPSHOT_NAME = "hotdeal_engine_snapshot"
+SORT_COLUMNS = {"date": "_시작일", "price": "최종혜택가"}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class Engine:
+    # 검색 / 플랫폼 필터 / 시뮬레이터 판정. 인덱스를 주지 않으면 새로 만들어 store 변경을 구독한다.
+    # 매 조회 전에 store 를 refresh 하므로 다른 프로세스(관리자 화면)의 등록/수정도 증분으로 반영된다.
+
+    def __init__(self, store, index=None, sort_index=None, aggregate=None, matcher=None):
+        self.store = store
+        self.index, self.sort_index = index or SearchIndex(), sort_index or SortIndex()
+        self.aggregate, self.matcher = aggregate or PriceAggregate(), matcher or FuzzyMatcher()
+        for idx, given in ((self.index, index), (self.sort_index, sort_index), (self.aggregate, aggregate), (self.matcher, matcher)):
+            if given is None: store.subscribe(idx.on_change)
+
+    def health(self):
+        db = self.store.snapshot()
+        return {"status": "ok", "rows": len(db), "version": self.store.version, "pid": os.getpid()}
+
+    def platforms(self):
+        self.store.snapshot()
+        return self.index.platforms()
+
+    def search(self, q="", platform=None, sort="date", order="desc", page=1, size=50):
+        # 정렬된 결과 중 page 번째 size 행 + 전체 건수/최저가/플랫폼별 요약. 범위를 벗어난 page 는 1페이지로
+        if sort not in SORT_COLUMNS: raise ValueError(f"sort 는 {', '.join(SORT_COLUMNS)} 중 하나여야 합니다.")
+        if order not in ("asc", "desc"): raise ValueError("order 는 asc, desc 중 하나여야 합니다.")
+        size = min(max(int(size), 1), MAX_PAGE_SIZE)
+        db = self.store.snapshot()
+        ordered = search_deals(self.index, self.sort_index, q, platform or None, SORT_COLUMNS[sort], order == "asc")
+        pages = max(1, -(-len(ordered) // size))
+        page = int(page) if 1 <= int(page) <= pages else 1
+        rows = take(db, page_ids(ordered, size, page))
+        out = rows[file_columns(rows)].copy()
+        out["역대최저"] = (rows["최종혜택가"] <= self.aggregate.lookup(rows)).to_numpy()
+        return {"total": len(ordered), "page": page, "pages": pages, "size": size,
+                "min_final": int(gather(db, ordered, "최종혜택가").min()) if len(ordered) else None,
+                "min_felt": int(gather(db, ordered, "체감가").min()) if len(ordered) else None,
+                "rows": out, "summary": summarize(db, ordered)}
+
+    def simulate(self, name, final=0, felt=0):
+        # 과거 기록(match_history: 정확 -> 부분 -> 유사)과 예상가별 판정 (문구, 수준). 기록이 없으면 history/판정이 None
+        db = self.store.snapshot()
+        model, method, hist = match_history(name, db, self.aggregate, self.index, self.matcher) if name and not db.empty else ("", "없음", None)
+        final, felt = extract_num(final), extract_num(felt)
+        return {"name": name, "model": model, "method": method, "history": hist, "window_days": self.aggregate.window_days,
+                "final": get_judgment(final, hist["min_final"]) if hist else None,
+                "felt": get_judgment(felt, hist["min_felt"]) if hist else None}
+
+    def simulate_plan(self, plan):
+        db = self.store.snapshot()
+        parts = [part for _, part in simulate_plan(plan, db, self.aggregate, self.index, self.matcher)]
+        return pd.concat(parts) if parts else plan.iloc[:0]
+
+    def lows(self, model):
+        self.store.snapshot()
+        return self.aggregate.get(model)
+
+
+# ---------- 메모리 매핑 스냅샷 (여러 워커 프로세스가 같은 파일을 공유) ----------
+def write_snapshot(store, path):
+    # store 의 현재 프레임/버전을 path 아래 새 디렉터리에 쓰고 CURRENT 를 교체한다.
+    # 숫자/날짜 컬럼은 .npy (mmap 으로 읽음), 문자열 컬럼은 NUL 로 이은 UTF-8 텍스트.
+    # 검색 posting 과 정렬 순서도 한 번 만들어 .npy 로 두어 워커가 다시 만들지 않고 mmap 으로 공유한다.
+    df, token = store.state()
+    os.makedirs(path, exist_ok=True)
+    name = f"v{token}-{os.getpid()}"
+    d = os.path.join(path, name)
+    os.makedirs(d, exist_ok=True)
+    cols = []
+    np.save(os.path.join(d, "index.npy"), df.index.to_numpy(dtype="int64"))
+    for i, c in enumerate(df.columns):
+        s = df[c]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            kind = "datetime"; np.save(os.path.join(d, f"c{i}.npy"), s.to_numpy(dtype="datetime64[ns]").view("int64"))
+        elif pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+            kind = str(s.dtype); np.save(os.path.join(d, f"c{i}.npy"), s.to_numpy())
+        else:
+            kind = "str"
+            with open(os.path.join(d, f"c{i}.txt"), "wb") as f:
+                f.write("\0".join(v.replace("\0", "") for v in s.astype(str).tolist()).encode("utf-8"))
+        cols.append({"name": c, "kind": kind})
+    for prefix, idx in (("search", SearchIndex()), ("sort", SortIndex())):
+        idx.on_change("reset", df)
+        for k, arr in idx.arrays().items(): np.save(os.path.join(d, f"{prefix}.{k}.npy"), arr)
+    with open(os.path.join(d, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"token": token, "rows": len(df), "columns": cols}, f, ensure_ascii=False)
+    tmp = os.path.join(path, f"CURRENT.{os.getpid()}")
+    with open(tmp, "w") as f: f.write(name)
+    os.replace(tmp, os.path.join(path, "CURRENT"))
+    for old in os.listdir(path):
+        if old != name and old.startswith("v") and os.path.isdir(os.path.join(path, old)): shutil.rmtree(os.path.join(path, old), ignore_errors=True)
+    return d
+
+
+def read_snapshot(path):
+    # (프레임, 버전 토큰, 검색 인덱스, 정렬 인덱스). 파일은 mmap 으로 읽으므로 여러 워커가 같은 페이지 캐시를 공유하고,
+    # DB 조회/날짜 파싱/n-gram 생성/정렬 없이 바로 프레임과 인덱스를 만든다.
+    with open(os.path.join(path, "CURRENT")) as f: d = os.path.join(path, f.read().strip())
+    with open(os.path.join(d, "meta.json"), encoding="utf-8") as f: meta = json.load(f)
+    n, data = meta["rows"], {}
+    for i, c in enumerate(meta["columns"]):
+        if c["kind"] == "str":
+            with open(os.path.join(d, f"c{i}.txt"), "rb") as f:
+                if n and os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: values = mm[:].decode("utf-8").split("\0")
+                else: values = [""] * n
+            data[c["name"]] = values
+        else:
+            arr = np.load(os.path.join(d, f"c{i}.npy"), mmap_mode="r")
+            data[c["name"]] = arr.view("datetime64[ns]") if c["kind"] == "datetime" else arr
+    df = pd.DataFrame(data, index=pd.Index(np.load(os.path.join(d, "index.npy")), dtype="int64")) if n else pd.DataFrame(columns=[c["name"] for c in meta["columns"]])
+    token = meta["token"]
+    arrays = lambda prefix: {f[len(prefix) + 1:-4]: np.load(os.path.join(d, f), mmap_mode="r") for f in os.listdir(d) if f.startswith(prefix + ".")}
+    return df, tuple(token) if isinstance(token, list) else token, SearchIndex().load(arrays("search"), df), SortIndex().load(arrays("sort"))
+
+
+# ---------- HTTP/JSON 서버 ----------
+def _jsonable(v):
+    if isinstance(v, pd.DataFrame): return v.to_dict("records")
+    if isinstance(v, (pd.Timestamp, np.datetime64)): return None if pd.isna(v) else pd.Timestamp(v).isoformat()
+    if isinstance(v, np.integer): return int(v)
+    if isinstance(v, np.floating): return None if np.isnan(v) else float(v)
+    if isinstance(v, np.bool_): return bool(v)
+    raise TypeError(f"{type(v).__name__} 는 JSON 으로 바꿀 수 없습니다.")
+
+
+def _encode(payload):
+    # DataFrame 의 NaN/NaT 는 null 로
+    if isinstance(payload, dict):
+        payload = {k: (v.astype(object).where(v.notna(), None) if isinstance(v, pd.DataFrame) else v) for k, v in payload.items()}
+    return json.dumps(payload, ensure_ascii=False, default=_jsonable).encode("utf-8")
+
+
+def _one(params, key, default=None):
+    v = params.get(key, default)
+    return v[0] if isinstance(v, list) else v
+
+
+def _int(params, key, default):
+    try: return int(_one(params, key, default))
+    except (TypeError, ValueError): raise ValueError(f"{key} 는 정수여야 합니다.")
+
+
+def _routes(engine):
+    # (메서드, 경로) -> 요청 파라미터(dict) 를 받아 응답 객체를 돌려주는 함수
+    def search(p):
+        return engine.search(_one(p, "q", ""), _one(p, "platform") or None, _one(p, "sort", "date"), _one(p, "order", "desc"),
+                             _int(p, "page", 1), _int(p, "size", 50))
+    def simulate(p):
+        return engine.simulate(_one(p, "name", ""), _one(p, "final", 0), _one(p, "felt", 0))
+    def lows(p):
+        hit = engine.lows(_one(p, "model", ""))
+        if hit is None: raise LookupError("해당 모델의 과거 기록이 없습니다.")
+        return hit
+    def batch(p):
+        rows = p.get("rows")
+        if not isinstance(rows, list): raise ValueError("rows 배열이 필요합니다.")
+        plan = pd.DataFrame(rows).reindex(columns=PLAN_COLS)
+        plan[PLAN_COLS[0]] = plan[PLAN_COLS[0]].fillna("").astype(str)
+        for c in PLAN_COLS[1:]: plan[c] = plan[c].map(extract_num).astype("int64")
+        return {"rows": engine.simulate_plan(plan)}
+    return {
+        ("GET", "/health"): lambda p: engine.health(),
+        ("GET", "/platforms"): lambda p: {"platforms": engine.platforms()},
+        ("GET", "/search"): search,
+        ("GET", "/simulate"): simulate,
+        ("GET", "/lows"): lows,
+        ("POST", "/simulate/batch"): batch,
+    }
+
+
+class EngineServer:
+    # asyncio 스트림 위의 최소 HTTP/1.1 서버 (keep-alive 지원). 조회는 스레드 풀에서 실행해 이벤트 루프를 막지 않는다.
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.routes = _routes(engine)
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, sock=None):
+        if sock is not None: self._server = await asyncio.start_server(self._handle, sock=sock)
+        else: self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server: await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None: self._server.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""): break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY: status, payload, body = 413, {"error": "요청 본문이 너무 큽니다."}, b""
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._dispatch(method, target, body)
+                data = _encode(payload)
+                keep = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1" and length <= MAX_BODY
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        url = urllib.parse.urlsplit(target)
+        fn = self.routes.get((method, url.path))
+        if fn is None:
+            return (405, {"error": f"{method} 는 지원하지 않습니다."}) if any(p == url.path for _, p in self.routes) else (404, {"error": f"{url.path} 경로가 없습니다."})
+        try:
+            params = urllib.parse.parse_qs(url.query)
+            if body:
+                extra = json.loads(body.decode("utf-8"))
+                if not isinstance(extra, dict): raise ValueError("JSON 객체 본문이 필요합니다.")
+                params.update(extra)
+            return 200, await asyncio.get_running_loop().run_in_executor(None, fn, params)
+        except LookupError as e:
+            return 404, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+
+def serve_in_thread(engine, host="127.0.0.1", port=0):
+    # 백그라운드 스레드에서 서버를 띄우고 (URL, 종료 함수) 를 돌려준다 (port=0 이면 빈 포트). 로컬 검증/내부 도구용
+    loop, ready, server = asyncio.new_event_loop(), threading.Event(), EngineServer(engine)
+    addr = []
+    def run():
+        asyncio.set_event_loop(loop)
+        addr.extend(loop.run_until_complete(server.start(host, port)))
+        ready.set()
+        loop.run_forever()
+    t = threading.Thread(target=run, daemon=True)
+    t.start(); ready.wait()
+    def stop():
+        loop.call_soon_threadsafe(server.close)
+        loop.call_soon_threadsafe(loop.stop)
+        t.join()
+    return f"http://{addr[0]}:{addr[1]}", stop
+
+
+def _worker(sock, csv_path, snapshot_path, backend):
+    # 워커: 공유 스냅샷(프레임 + 검색/정렬 인덱스)으로 시작해 그 이후 변경분만 DB 에서 읽고,
+    # 부모가 연 리스닝 소켓을 함께 받아 처리한다. 가격 집계/유사 매칭 인덱스만 워커마다 새로 만든다
+    df, token, index, sort_index = read_snapshot(snapshot_path)
+    store = open_store(csv_path, MASTER_COLS, backend)
+    engine = Engine(store, index=index, sort_index=sort_index)
+    store.seed(df, token, (index.on_change, sort_index.on_change))
+    server = EngineServer(engine)
+    async def main():
+        await server.start(sock=sock)
+        await server.serve_forever()
+    try: asyncio.run(main())
+    except KeyboardInterrupt: pass
+
+
+def serve(csv_path, host="127.0.0.1", port=DEFAULT_PORT, workers=1, backend=None, snapshot_path=None, log=print):
+    # workers 가 1 이면 이 프로세스에서 바로 서비스. 2 이상이면 스냅샷을 한 번 쓰고 같은 소켓을 듣는 워커 프로세스를 띄운다
+    store = open_store(csv_path, MASTER_COLS, backend)
+    if workers <= 1:
+        server = EngineServer(Engine(store))
+        async def main():
+            log(f"조회 엔진 http://{':'.join(map(str, await server.start(host, port)))} ({len(store.snapshot()):,}건)")
+            await server.serve_forever()
+        try: asyncio.run(main())
+        except KeyboardInterrupt: pass
+        return
+    if (backend or os.environ.get("HOTDEAL_BACKEND", "sqlite")) != "sqlite":
+        raise ValueError("여러 워커는 행 id 가 프로세스 밖에서도 유지되는 SQLite 백엔드에서만 지원합니다.")
+    snapshot_path = snapshot_path or os.path.join(os.path.dirname(os.path.abspath(csv_path)), SNAPSHOT_NAME)
+    write_snapshot(store, snapshot_path)
+    sock = socket.create_server((host, port))
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_worker, args=(sock, csv_path, snapshot_path, backend), daemon=True) for _ in range(workers)]
+    for p in procs: p.start()
+    log(f"조회 엔진 http://{host}:{sock.getsockname()[1]} (워커 {workers}개, {len(store.snapshot()):,}건)")
+    try:
+        for p in procs: p.join()
+    except KeyboardInterrupt:
+        for p in procs: p.terminate()
+    finally:
+        sock.close()
+
+
+# ---------- 클라이언트 (Streamlit 앱, 내부 도구) ----------
+class EngineClient:
+    # Engine 과 같은 메서드/반환 형태로 HTTP API 를 호출한다 (rows/summary 는 DataFrame 으로 복원)
+
+    def __init__(self, url, timeout=10):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, path, params=None, body=None):
+        url = self.url + path + ("?" + urllib.parse.urlencode({k: v for k, v in (params or {}).items() if v is not None}) if params else "")
+        data = None if body is None else json.dumps(body, ensure_ascii=False, default=_jsonable).encode("utf-8")
+        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"} if data else {})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as r: return json.loads(r.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try: msg = json.loads(e.read().decode("utf-8")).get("error")
+            except ValueError: msg = None
+            if e.code == 404 and path == "/lows": return None
+            raise ValueError(msg or f"조회 엔진 오류 ({e.code})")
+        except (urllib.error.URLError, OSError) as e:
+            raise ValueError(f"조회 엔진({self.url})에 연결할 수 없습니다: {e}")
+
+    def health(self):
+        return self._call("/health")
+
+    def platforms(self):
+        return self._call("/platforms")["platforms"]
+
+    def search(self, q="", platform=None, sort="date", order="desc", page=1, size=50):
+        res = self._call("/search", {"q": q, "platform": platform, "sort": sort, "order": order, "page": page, "size": size})
+        res["rows"] = pd.DataFrame(res["rows"])
+        res["summary"] = pd.DataFrame(res["summary"], columns=["플랫폼", "건수", "최저", "중앙값"])
+        return res
+
+    def simulate(self, name, final=0, felt=0):
+        return self._call("/simulate", {"name": name, "final": final, "felt": felt})
+
+    def simulate_plan(self, plan):
+        rows = self._call("/simulate/batch", body={"rows": plan[PLAN_COLS].to_dict("records")})["rows"]
+        return pd.DataFrame(rows).astype({"과거 최종최저": "float64", "과거 체감최저": "float64"}) if rows else plan.iloc[:0]
+
+    def lows(self, model):
+        return self._call("/lows", {"model": model})
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="핫딜 조회 엔진 (로컬 HTTP/JSON API)")
+    sub = ap.add_subparsers(dest="action", required=True)
+    sv = sub.add_parser("serve", help="엔진 실행")
+    sv.add_argument("--csv", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotdeal_master_db.csv"))
+    sv.add_argument("--host", default="127.0.0.1")
+    sv.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sv.add_argument("--workers", type=int, default=1)
+    sv.add_argument("--backend", choices=["sqlite", "csv"])
+    sv.add_argument("--snapshot", help=f"워커 공유 스냅샷 디렉터리 (기본: DB 옆 {SNAPSHOT_NAME})")
+    a = ap.parse_args()
+    serve(a.csv, a.host, a.port, a.workers, a.backend, a.snapshot)
@@ -0,0 +1,218 @@
+# 플랫폼 딜 피드(CSV/Excel) 일괄 등록 - 청크 단위 읽기, 할인 계산 벡터화, 브랜드/모델명 정규화, 중복 제거
+
+import glob
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+from difflib import get_close_matches
+
+import numpy as np
+import pandas as pd
+
+from hotdeal_index import norm_key
+from hotdeal_sim import match_models
+from hotdeal_store import parse_number, parse_price, text_encoding
+
+CHUNK_ROWS = 5000
+PREVIEW_ROWS = 200  # 검증 결과 중 화면 미리보기로 메모리에 두는 행 수
+SPOOL_TTL = 24 * 3600  # 이보다 오래 손대지 않은 검증 임시 디렉터리는 버려진 세션의 것으로 보고 지운다 (초)
+
+# 카테고리별 대표 브랜드 (등록 화면 선택지, 피드 브랜드 정규화 기준)
+BRAND_DICT = {
+    "디지털/가전": ["삼성전자", "LG전자", "애플", "소니", "다이슨", "샤오미", "필립스", "로지텍", "쿠쿠", "쿠첸"],
+    "가공식품": ["CJ제일제당", "오뚜기", "농심", "동원F&B", "대상(청정원)", "풀무원", "삼양식품", "팔도", "매일유업", "빙그레"],
+    "신선식품": ["하림", "목우촌", "팜스코", "선진포크", "본죽", "한우한돈", "우리수산", "프레시지", "마켓컬리"],
+    "건강기능식품": ["정관장", "종근당건강", "뉴트리원", "에스더포뮬러", "고려은단", "세노비스", "안국건강", "락토핏"],
+    "생활/리빙": ["유한양행", "피앤지", "LG생활건강", "애경", "깨끗한나라", "한샘", "모던하우스", "다이소", "테팔"],
+    "패션/잡화": ["나이키", "아디다스", "뉴발란스", "노스페이스", "구찌", "프라다", "지오다노", "무신사스탠다드", "크록스"],
+    "뷰티": ["아모레퍼시픽", "올리브영", "설화수", "닥터자르트", "이니스프리", "랑콤", "에스티로더", "헤라", "넘버즈인"]
+}
+
+# 플랫폼별 내보내기 파일의 컬럼명 -> 표준 컬럼명
+COLUMN_ALIASES = {
+    "상품명": "제품명", "브랜드명": "브랜드", "판매가": "정상가", "정가": "정상가", "판매처": "플랫폼", "채널": "플랫폼",
+    "쿠폰": "쿠폰할인", "카드": "카드할인", "기타할인": "기타할인1", "혜택가": "최종혜택가", "사은품구성": "사은품", "사은품 구성": "사은품",
+    "시작일": "행사시작일", "종료일": "행사종료일",
+}
+# (할인 값 컬럼, 단위 컬럼) - 단위가 "%" 이거나 값에 % 가 붙어 있으면 정상가 대비 비율, 아니면 원
+DISCOUNT_COLS = [("쿠폰할인", "쿠폰단위"), ("카드할인", "카드단위"), ("기타할인1", "기타1단위"), ("기타할인2", "기타2단위")]
+FEED_COLS = ["플랫폼", "카테고리", "브랜드", "제품명", "표준모델명", "정상가"] + [c for pair in DISCOUNT_COLS for c in pair] + ["최종혜택가", "체감가", "사은품", "행사일정", "행사시작일", "행사종료일"]
+
+
+def final_price(base, discounts):
+    # 정상가에서 (값, 단위) 할인들을 차례로 뺀 혜택가 (원 단위 절사). 스칼라/배열 모두 지원
+    total = base
+    for value, unit in discounts:
+        total = total - np.where(np.asarray(unit) == "%", base * (np.asarray(value) / 100), value)
+    return np.trunc(total).astype("int64")
+
+
+def read_feed(data, name, chunk_rows=CHUNK_ROWS):
+    # (청크 DataFrame, 진행률 0~1) 을 차례로 돌려준다. 모든 값은 문자열로 읽는다. CSV 는 utf-8 이 아니면 cp949 로 읽는다.
+    if name.lower().endswith((".xlsx", ".xlsm")):
+        yield from _excel_chunks(data, chunk_rows)
+        return
+    f = io.BytesIO(data) if isinstance(data, bytes) else data
+    size = max(f.seek(0, io.SEEK_END), 1)
+    f.seek(0)
+    for chunk in pd.read_csv(f, dtype=str, chunksize=chunk_rows, encoding=text_encoding(f), sep=None, engine="python"):
+        yield chunk, min(f.tell() / size, 1.0)
+
+
+def _excel_chunks(data, chunk_rows):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("엑셀 피드를 읽으려면 openpyxl 패키지가 필요합니다. CSV 로 저장해 올려 주세요.")
+    ws = load_workbook(io.BytesIO(data) if isinstance(data, bytes) else data, read_only=True, data_only=True).active
+    rows = ws.iter_rows(values_only=True)
+    header = [str(c).strip() if c is not None else "" for c in next(rows, [])]
+    total, buf, done = max((ws.max_row or 1) - 1, 1), [], 0
+    for row in rows:
+        buf.append(["" if v is None else str(v) for v in row[:len(header)]])
+        if len(buf) >= chunk_rows:
+            done += len(buf)
+            yield pd.DataFrame(buf, columns=header), min(done / total, 1.0)
+            buf = []
+    if buf: yield pd.DataFrame(buf, columns=header), 1.0
+
+
+def _brand_key(name):
+    return re.sub(r"\s+|\(주\)|㈜|주식회사", "", str(name)).lower()
+
+
+class BrandNormalizer:
+    # 피드의 브랜드 표기를 BRAND_DICT 의 대표 브랜드로 맞추고 카테고리를 추정한다
+    # (공백/법인 표기 무시, 괄호 안 별칭 인정, 그래도 없으면 유사도 0.8 이상인 대표 브랜드)
+
+    def __init__(self, brand_dict, cutoff=0.8):
+        self.cutoff = cutoff
+        self._canon = {}  # 정규화 키 -> (대표 브랜드, 카테고리)
+        for cat, names in brand_dict.items():
+            for b in names:
+                for alias in [b] + re.findall(r"[^()]+", b):
+                    self._canon.setdefault(_brand_key(alias), (b, cat))
+        self._memo = {}
+
+    def resolve(self, name):
+        if name not in self._memo:
+            key = _brand_key(name)
+            hit = self._canon.get(key)
+            if hit is None and key:
+                close = get_close_matches(key, list(self._canon), n=1, cutoff=self.cutoff)
+                hit = self._canon[close[0]] if close else None
+            self._memo[name] = hit or (name, "")
+        return self._memo[name]
+
+    def __call__(self, s):
+        pairs = [self.resolve(v) for v in s.tolist()]
+        return pd.Series([p[0] for p in pairs], index=s.index), pd.Series([p[1] for p in pairs], index=s.index)
+
+
+def prepare_chunk(chunk, brands, aggregate, matcher, defaults):
+    # 피드 청크 -> 마스터 DB 행. defaults: 플랫폼/카테고리/행사일정/등록날짜 기본값
+    df = chunk.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip(), str(c).strip()))
+    blank = pd.Series("", index=df.index)
+    col = lambda c: df[c].fillna("").astype(str).str.strip() if c in df.columns else blank
+    df = df[col("제품명") != ""]
+    blank = pd.Series("", index=df.index)
+    out = pd.DataFrame({"선택": False, "등록날짜": defaults["등록날짜"]}, index=df.index)
+    out["플랫폼"] = col("플랫폼").replace("", defaults["플랫폼"])
+    out["브랜드"], guessed = brands(col("브랜드"))
+    out["카테고리"] = col("카테고리").where(col("카테고리") != "", guessed.replace("", defaults["카테고리"]))
+    out["제품명"] = col("제품명")
+    given = col("표준모델명")
+    models, methods = match_models(out["제품명"].tolist(), aggregate, matcher)
+    methods = pd.Series(methods, index=df.index)
+    matched = pd.Series(models, index=df.index).where(methods != "없음", out["제품명"])
+    out["표준모델명"] = given.where(given != "", matched)
+    out["_매칭방식"] = methods.where(given == "", "지정")  # 미리보기용 (지정: 피드에 표준모델명이 있음)
+    # 중복 판단용 모델명: 피드가 지정한 표준모델명, 없으면 제품명 (유사 매칭 결과로는 중복을 판단하지 않는다)
+    out["_식별모델"] = given.where(given != "", out["제품명"])
+    base = parse_number(col("정상가")).to_numpy()
+    discounts = [(parse_number(col(v)).to_numpy(), np.where((col(u) == "%") | col(v).str.contains("%", regex=False), "%", "원")) for v, u in DISCOUNT_COLS]
+    no_discount = np.logical_and.reduce([col(v).to_numpy() == "" for v, _ in DISCOUNT_COLS])
+    given_final = parse_price(col("최종혜택가")).to_numpy()
+    out["정상가"] = base.astype("int64")
+    out["최종혜택가"] = np.where(no_discount & (given_final > 0), given_final, final_price(base, discounts))
+    out["체감가"] = parse_price(col("체감가"))
+    out["사은품"] = col("사은품")
+    # 행사일정: "시작 ~ 종료" 문자열 또는 시작일/종료일 컬럼, 둘 다 없으면 기본 일정
+    raw = col("행사일정").where(col("행사일정") != "", (col("행사시작일") + "~" + col("행사종료일")).str.strip("~"))
+    parts = raw.str.split(r"\s*~\s*", n=1, regex=True)
+    start = pd.to_datetime(parts.str[0], errors="coerce", format="mixed")
+    end = pd.to_datetime(parts.str[-1], errors="coerce", format="mixed").fillna(start)
+    out["행사일정"] = (start.dt.strftime("%Y-%m-%d") + " ~ " + end.dt.strftime("%Y-%m-%d")).fillna(defaults["행사일정"])
+    return out
+
+
+def _keys(df, model_col):
+    return zip(df["플랫폼"].map(norm_key), df[model_col].map(norm_key), df["행사일정"].map(norm_key))
+
+
+def registered_keys(db):
+    # 기존 DB 의 (플랫폼, 모델, 행사일정) 키. 모델은 표준모델명과 제품명 둘 다 (예전 피드가 유사 매칭 모델로 저장된 경우 대비)
+    return set(_keys(db, "표준모델명")) | set(_keys(db, "제품명"))
+
+
+def prepare_feed(chunks, db, brand_dict, aggregate, matcher, defaults):
+    # 청크마다 (진행률, 누적 읽은 행 수, 신규 행, 제외한 행 수) 를 돌려준다.
+    # 제품명이 비었거나 (플랫폼, 식별 모델명, 행사일정) 이 기존 DB / 앞선 피드 행과 같으면 제외한다.
+    seen = registered_keys(db)
+    brands, read = BrandNormalizer(brand_dict), 0
+    for chunk, frac in chunks:
+        read += len(chunk)
+        rows = prepare_chunk(chunk, brands, aggregate, matcher, defaults)
+        keep = []
+        for k in _keys(rows, "_식별모델"):
+            keep.append(k not in seen)
+            seen.add(k)
+        yield frac, read, rows[keep], len(chunk) - sum(keep)
+
+
+def unregistered(chunks, db):
+    # 등록 시점에 다시 확인: 검증 이후 다른 곳에서 먼저 등록된 행은 뺀다
+    seen = registered_keys(db)
+    for rows in chunks:
+        yield rows[[k not in seen for k in _keys(rows, "_식별모델")]]
+
+
+class FeedSpool:
+    # 검증을 마친 피드 행을 청크별 임시 파일(pickle)로 쌓아 두고, 세션 메모리에는 미리보기와 건수만 둔다.
+    # 등록이 끝나거나 새 피드로 바뀌면 close() 로 임시 디렉터리를 지운다.
+    # 세션이 버려져 close() 되지 못한 디렉터리는 다음 FeedSpool 을 만들 때 SPOOL_TTL 기준으로 정리한다.
+
+    def __init__(self, preview_rows=PREVIEW_ROWS):
+        clean_stale_spools()
+        self.dir = tempfile.mkdtemp(prefix="hotdeal_feed_")
+        self.preview_rows = preview_rows
+        self.preview = pd.DataFrame()
+        self.rows, self.skipped = 0, 0
+        self._files = []
+
+    def add(self, rows, skipped=0):
+        self.skipped += skipped
+        if not len(rows): return
+        path = os.path.join(self.dir, f"{len(self._files):05d}.pkl")
+        rows.to_pickle(path)
+        self._files.append(path)
+        self.rows += len(rows)
+        if len(self.preview) < self.preview_rows:
+            self.preview = pd.concat([self.preview, rows.head(self.preview_rows - len(self.preview))])
+
+    def chunks(self):
+        for path in self._files: yield pd.read_pickle(path)
+
+    def close(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def clean_stale_spools(ttl=SPOOL_TTL):
+    cutoff = time.time() - ttl
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), "hotdeal_feed_*")):
+        try:
+            if os.path.getmtime(path) < cutoff: shutil.rmtree(path, ignore_errors=True)
+        except OSError: pass  # 다른 프로세스가 먼저 지운 경우
@@ -0,0 +1,530 @@
+# 핫딜 조회용 메모리 인덱스
+# DataStore 변경 알림(subscribe)을 받아 증분으로 갱신된다.
+
+import bisect
+import heapq
+import threading
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ("브랜드", "제품명", "표준모델명")
+
+
+def take(df, ids):
+    # 인덱스가 돌려준 행 id 중 현재 스냅샷에 있는 것만 골라낸다 (전체 스캔 없이 해시 조회)
+    pos = df.index.get_indexer(ids)
+    return df.iloc[pos[pos >= 0]]
+
+
+GRAM_BLOCK = 50000  # SearchIndex 기본 색인을 만들 때 한 번에 n-gram 으로 펼치는 행 수
+DELTA_ROWS = 5000  # SearchIndex 증분 영역이 이 행 수(또는 기본 색인의 1/8)를 넘으면 기본 색인으로 합친다
+
+
+def _grams(text):
+    # 1글자(단일 문자 검색용) + 2글자 n-gram. 한글은 음절 단위 bigram 이 가장 효율적
+    return set(text) | {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _codepoints(values):
+    # 문자열 목록 -> 구분 문자(0)로 이어 붙인 코드포인트 배열 (값마다 끝에 0)
+    return np.frombuffer(("\0".join(values) + "\0").encode("utf-32-le"), dtype="uint32")
+
+
+def _block_grams(cols, lut, a, lo, hi):
+    # 행 위치 lo~hi 의 모든 필드에서 (gram 키, 행 위치) 쌍. 구분 문자를 걸치는 bigram 은 만들지 않는다
+    chars, pos = [], []
+    for col in cols:
+        part = col[lo:hi]
+        lens = np.fromiter(map(len, part), dtype="int64", count=len(part))
+        chars.append(_codepoints(part))
+        pos.append(np.repeat(np.arange(lo, hi, dtype="int64"), lens + 1))
+    chars, pos = np.concatenate(chars), np.concatenate(pos)
+    ok = chars != 0
+    both = ok[:-1] & ok[1:]
+    dense = lut[chars]
+    return np.concatenate([dense[ok], (dense[:-1][both] + 1) * a + dense[1:][both]]), np.concatenate([pos[ok], pos[:-1][both]])
+
+
+def _unique(a):
+    a.sort()
+    return a[_firsts(a)]
+
+
+def _firsts(*cols):
+    # 정렬된 배열(들)에서 앞 행과 값이 달라지는 위치
+    keep = np.ones(len(cols[0]), dtype=bool)
+    if len(keep): keep[1:] = np.logical_or.reduce([c[1:] != c[:-1] for c in cols])
+    return keep
+
+
+def _intersect(a, b):
+    # 정렬된 두 위치 배열의 교집합 (작은 쪽 기준 이진 탐색)
+    if len(a) > len(b): a, b = b, a
+    if not len(a) or not len(b): return a[:0]
+    i = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[i] == a]
+
+
+class SearchIndex:
+    # 브랜드/제품명/표준모델명 문자 n-gram 역색인 + 플랫폼 코드 배열
+    # 기본 색인은 numpy 로 한 번에 만든 CSR 형태(gram 키 정렬 배열 + 오프셋 + int32 행 위치)이고,
+    # 이후 추가/수정된 행은 작은 증분 영역(gram -> {rid})에 두었다가 커지면 기본 색인으로 다시 합친다.
+    # 후보는 posting 교집합으로 찾고, 실제 포함 여부는 대소문자 무시 리터럴 비교로 검증한다.
+
+    def __init__(self, fields=SEARCH_FIELDS):
+        self.fields = tuple(fields)
+        self._lock = threading.RLock()
+        self._build(np.array([], dtype="int64"), [[] for _ in self.fields], [])
+
+    # ---------- DataStore 변경 알림 ----------
+    def on_change(self, kind, frame):
+        with self._lock:
+            cols = [frame[f].astype(str).str.lower().tolist() if f in frame.columns else [""] * len(frame) for f in self.fields]
+            plats = frame["플랫폼"].astype(str).tolist() if "플랫폼" in frame.columns else [""] * len(frame)
+            if kind == "reset": return self._build(frame.index.to_numpy(dtype="int64"), cols, plats)
+            for rid, plat, *vals in zip(frame.index.tolist(), plats, *cols):
+                self._remove(rid)
+                if kind == "upsert": self._add(rid, tuple(vals), plat)
+            if len(self._extra) > max(DELTA_ROWS, len(self._ids) // 8): self._compact()
+
+    def _build(self, ids, cols, plats):
+        order = np.argsort(ids, kind="stable")
+        n = len(ids)
+        self._ids = np.asarray(ids, dtype="int64")[order]  # 기본 색인 위치 -> 행 id (정렬)
+        self._text = [np.asarray(c, dtype=object)[order] for c in cols]  # 필드별 소문자 값
+        codes, names = pd.factorize(pd.Series(plats, dtype=object)) if n else (np.array([], dtype="int64"), [])
+        self._plat_code = codes[order].astype("int32")
+        self._plat_names = list(names)
+        # gram 키: 1글자 = 문자 조밀 코드 c, 2글자 = (앞 c + 1) * a + 뒤 c
+        present = np.zeros(0x110000, dtype=bool)
+        for col in self._text:
+            present[_codepoints(col)] = True
+        present[0] = False
+        alpha = np.flatnonzero(present)
+        self._alpha = {chr(c): i for i, c in enumerate(alpha.tolist())}  # 문자 -> 조밀 코드
+        a, m = len(alpha), max(n, 1)
+        lut = np.cumsum(present, dtype="int64") - 1
+        blocks = (_block_grams(self._text, lut, a, lo, min(lo + GRAM_BLOCK, n)) for lo in range(0, n, GRAM_BLOCK))
+        empty = np.array([], dtype="int64")
+        if (a + 1) * (a + 1) * m < 2 ** 62:
+            # 보통의 경우: 행 블록마다 (키 * m + 위치) 하나로 합쳐 정렬·중복 제거한 뒤 한 번 더 정렬
+            # (블록끼리는 행 위치가 겹치지 않으므로 중복은 블록 안에서만 생긴다)
+            pairs = np.concatenate([_unique(k * m + p) for k, p in blocks] + [empty])
+            pairs.sort()
+            keys = pairs // m
+            pos = pairs - keys * m
+            del pairs
+        else:
+            # 문자 종류가 너무 많아 하나로 합칠 수 없으면 (키, 위치) 를 그대로 정렬
+            keys, pos = (np.concatenate(list(c) + [empty]) for c in zip(*blocks)) if n else (empty, empty)
+            o = np.lexsort((pos, keys))
+            keys, pos = keys[o], pos[o]
+            first = _firsts(keys, pos)
+            keys, pos = keys[first], pos[first]
+        starts = np.flatnonzero(_firsts(keys))
+        self._keys = keys[starts]  # 정렬된 gram 키
+        self._offsets = np.append(starts, len(keys))  # gram i 의 posting = _post[_offsets[i]:_offsets[i + 1]]
+        self._post = pos.astype("int32")  # gram 별로 정렬된 행 위치
+        self._start_delta()
+
+    def _start_delta(self):
+        # 기본 색인만 있는 상태에서 증분 영역/플랫폼 집계를 새로 시작한다
+        self._plat_ids = {p: i for i, p in enumerate(self._plat_names)}
+        self._plat_count = Counter(dict(zip(self._plat_names, np.bincount(self._plat_code, minlength=len(self._plat_names)).tolist())))
+        self._alive = np.ones(len(self._ids), dtype=bool)
+        self._extra = {}  # 증분 영역: rid -> (소문자 필드값, 플랫폼)
+        self._delta = {}  # 증분 영역: gram -> {rid}
+
+    # ---------- 스냅샷 (조회 엔진 워커가 mmap 으로 공유) ----------
+    def arrays(self):
+        # 기본 색인 배열 (증분 영역은 먼저 합친다). 필드 값은 같은 시점의 프레임에서 다시 얻으므로 넣지 않는다
+        with self._lock:
+            if self._extra or not self._alive.all(): self._compact()
+            return {"ids": self._ids, "keys": self._keys, "offsets": self._offsets, "post": self._post, "plat_code": self._plat_code,
+                    "plat_names": np.array(self._plat_names, dtype=str), "alpha": np.array([ord(c) for c in self._alpha], dtype="int64")}
+
+    def load(self, arrays, frame):
+        # arrays() 결과(읽기 전용 mmap 이어도 됨)와 같은 시점의 프레임으로 색인을 되살린다 (n-gram 을 다시 만들지 않음)
+        with self._lock:
+            self._ids, self._keys, self._offsets, self._post, self._plat_code = (arrays[k] for k in ("ids", "keys", "offsets", "post", "plat_code"))
+            self._plat_names = arrays["plat_names"].tolist()
+            self._alpha = {chr(c): i for i, c in enumerate(arrays["alpha"].tolist())}
+            pos = frame.index.get_indexer(self._ids)
+            self._text = [frame[f].astype(str).str.lower().to_numpy(dtype=object)[pos] if f in frame.columns else np.full(len(pos), "", dtype=object) for f in self.fields]
+            self._start_delta()
+        return self
+
+    def _compact(self):
+        # 살아 있는 기본 색인 행 + 증분 영역을 합쳐 기본 색인을 다시 만든다
+        live = np.flatnonzero(self._alive)
+        names = self._plat_names
+        extra = list(self._extra.items())
+        ids = np.concatenate([self._ids[live], np.array([rid for rid, _ in extra], dtype="int64")])
+        cols = [col[live].tolist() + [vals[i] for _, (vals, _) in extra] for i, col in enumerate(self._text)]
+        plats = [names[c] for c in self._plat_code[live].tolist()] + [plat for _, (_, plat) in extra]
+        self._build(ids, cols, plats)
+
+    def _base_pos(self, rid):
+        p = int(np.searchsorted(self._ids, rid))
+        return p if p < len(self._ids) and self._ids[p] == rid else None
+
+    def _add(self, rid, vals, plat):
+        self._extra[rid] = (vals, plat)
+        for g in set().union(*(_grams(v) for v in vals)):
+            self._delta.setdefault(g, set()).add(rid)
+        self._plat_count[plat] += 1
+
+    def _remove(self, rid):
+        item = self._extra.pop(rid, None)
+        if item is not None:
+            for g in set().union(*(_grams(v) for v in item[0])):
+                ids = self._delta.get(g)
+                if ids is not None:
+                    ids.discard(rid)
+                    if not ids: del self._delta[g]
+            self._plat_count[item[1]] -= 1
+            return
+        p = self._base_pos(rid)
+        if p is not None and self._alive[p]:
+            self._alive[p] = False
+            self._plat_count[self._plat_names[self._plat_code[p]]] -= 1
+
+    def _postings(self, g):
+        # 기본 색인에서 gram g 가 들어 있는 행 위치 (정렬된 int32 배열)
+        c = [self._alpha.get(ch) for ch in g]
+        if None in c: return self._post[:0]
+        key = c[0] if len(c) == 1 else (c[0] + 1) * len(self._alpha) + c[1]
+        i = int(np.searchsorted(self._keys, key))
+        if i == len(self._keys) or self._keys[i] != key: return self._post[:0]
+        return self._post[self._offsets[i]:self._offsets[i + 1]]
+
+    # ---------- 조회 ----------
+    def platforms(self):
+        with self._lock:
+            return sorted(p for p, k in self._plat_count.items() if k > 0 and p.strip() != "")
+
+    def search(self, query="", platform=None, fields=None):
+        # query 가 비어 있으면 플랫폼 조건만 적용. 반환값은 정렬된 행 id 배열
+        q = query.lower() if query and query.strip() else ""
+        grams = ({q} if len(q) == 1 else {q[i:i + 2] for i in range(len(q) - 1)}) if q else set()
+        # 2글자 이하 전체 필드 검색은 posting 자체가 정확한 결과이므로 검증 생략
+        fpos = [self.fields.index(f) for f in (fields or self.fields)] if q and (len(q) > 2 or fields) else None
+        with self._lock:
+            # 기본 색인
+            if grams:
+                lists = sorted((self._postings(g) for g in grams), key=len)
+                pos = lists[0]
+                for other in lists[1:]: pos = _intersect(pos, other)
+            else:
+                pos = np.arange(len(self._ids))
+            pos = pos[self._alive[pos]]
+            if platform is not None: pos = pos[self._plat_code[pos] == self._plat_ids.get(platform, -1)]
+            if fpos is not None:
+                pos = pos[np.fromiter((any(q in self._text[i][p] for i in fpos) for p in pos.tolist()), dtype=bool, count=len(pos))]
+            base = self._ids[pos]
+            # 증분 영역
+            if not self._extra: return base
+            cand = set(self._extra)
+            for g in sorted(grams, key=lambda g: len(self._delta.get(g, ()))):
+                cand &= self._delta.get(g, set())
+                if not cand: break
+            extra = [rid for rid in cand if (platform is None or self._extra[rid][1] == platform)
+                     and (fpos is None or any(q in self._extra[rid][0][i] for i in fpos))]
+            return np.sort(np.concatenate([base, np.array(extra, dtype="int64")]))
+
+
+class FuzzyMatcher:
+    # difflib.get_close_matches(word, 표준모델명 목록, n, cutoff) 와 같은 결과를 돌려주는 색인형 매처.
+    # 문자별 posting(모델 id, 등장 횟수)으로 모든 모델의 quick_ratio 상한을 numpy 로 한 번에 구한 뒤,
+    # 상한이 높은 순으로 SequenceMatcher.ratio() 를 계산하고 상한이 n 번째 점수 아래로 떨어지면 멈춘다.
+
+    MEMO_SIZE = 512
+    BLOCK = 256
+
+    def __init__(self, field="표준모델명"):
+        self.field = field
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._names = []  # 모델 id -> 이름
+        self._ids = {}  # 이름 -> 모델 id
+        self._lens = []  # 모델 id -> 글자 수
+        self._refs = []  # 모델 id -> 이 이름을 가진 행 수 (0 이면 후보에서 제외)
+        self._rows = {}  # 행 id -> 모델 id
+        self._chars = {}  # 문자 -> ([모델 id], [등장 횟수])
+        self._arrays = {}  # 문자 -> numpy 변환 캐시 (해당 문자 posting 이 바뀌면 폐기)
+        self._memo = OrderedDict()  # (검색어, n, cutoff) -> 결과
+        self._dense = None  # (글자 수 배열, 유효 여부 배열) 캐시
+
+    # ---------- DataStore 변경 알림 ----------
+    def on_change(self, kind, frame):
+        with self._lock:
+            if kind == "reset": self._reset()
+            names = frame[self.field].astype(str).tolist() if self.field in frame.columns else [""] * len(frame)
+            for rid, name in zip(frame.index.tolist(), names):
+                old = self._rows.pop(rid, None)
+                if old is not None: self._refs[old] -= 1
+                if kind != "delete": self._rows[rid] = self._add_name(name)
+            self._memo.clear()
+            self._dense = None
+
+    def _add_name(self, name):
+        mid = self._ids.get(name)
+        if mid is None:
+            mid = self._ids[name] = len(self._names)
+            self._names.append(name); self._lens.append(len(name)); self._refs.append(0)
+            for c, cnt in Counter(name).items():
+                ids, cnts = self._chars.setdefault(c, ([], []))
+                ids.append(mid); cnts.append(cnt)
+                self._arrays.pop(c, None)
+        self._refs[mid] += 1
+        return mid
+
+    def _posting(self, c):
+        arr = self._arrays.get(c)
+        if arr is None:
+            ids, cnts = self._chars[c]
+            arr = self._arrays[c] = (np.array(ids, dtype="int64"), np.array(cnts, dtype="int64"))
+        return arr
+
+    # ---------- 조회 ----------
+    def close_matches(self, word, n=5, cutoff=0.6):
+        key = (word, n, cutoff)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return list(self._memo[key])
+            res = self._search(word, n, cutoff)
+            self._memo[key] = res
+            if len(self._memo) > self.MEMO_SIZE: self._memo.popitem(last=False)
+            return list(res)
+
+    def _search(self, word, n, cutoff):
+        total = len(self._names)
+        if not total or n <= 0: return []
+        overlap = np.zeros(total)
+        for c, qc in Counter(word).items():
+            if c not in self._chars: continue
+            ids, cnts = self._posting(c)
+            overlap += np.bincount(ids, weights=np.minimum(cnts, qc), minlength=total)
+        if self._dense is None:
+            self._dense = (np.array(self._lens, dtype="int64"), np.array(self._refs) > 0)
+        lens, alive = self._dense
+        lens = lens + len(word)
+        bound = np.where(lens > 0, 2.0 * overlap / np.maximum(lens, 1), 1.0)
+        cand = np.flatnonzero((bound >= cutoff) & alive)
+        s = SequenceMatcher()
+        s.set_seq2(word)
+        best = []  # (score, 이름) 최소 힙, 크기 n
+        # 보통 상한 상위 몇십 개 안에서 끝나므로 전체 정렬 대신 상위 블록만 정렬해 차례로 검사
+        while len(cand):
+            k = min(len(cand), self.BLOCK)
+            top = np.argpartition(-bound[cand], k - 1)[:k] if k < len(cand) else np.arange(len(cand))
+            block, rest = cand[top], np.delete(cand, top)
+            for mid in block[np.argsort(-bound[block], kind="stable")].tolist():
+                if len(best) == n and bound[mid] < best[0][0]: return [x for score, x in sorted(best, reverse=True)]
+                x = self._names[mid]
+                s.set_seq1(x)
+                if s.real_quick_ratio() < cutoff or s.quick_ratio() < cutoff: continue
+                item = (s.ratio(), x)
+                if item[0] < cutoff: continue
+                if len(best) < n: heapq.heappush(best, item)
+                elif item > best[0]: heapq.heapreplace(best, item)
+            cand = rest
+        return [x for score, x in sorted(best, reverse=True)]
+
+
+def norm_key(v):
+    return str(v).strip().lower()
+
+
+class PriceAggregate:
+    # 표준모델명(필요하면 플랫폼/카테고리까지) 키별 가격 집계.
+    # 행 단위 변경 알림마다 해당 키의 통계만 무효화하고, 조회 시 그 키의 행만으로 다시 계산한다.
+
+    def __init__(self, keys=("표준모델명",), window_days=90):
+        self.keys = tuple(keys)
+        self.window_days = window_days
+        self._lock = threading.RLock()
+        self._rows = {}  # 행 id -> 키
+        self._groups = {}  # 키 -> {행 id: (최종혜택가, 체감가, 시작일)}
+        self._stats = {}  # 키 -> (계산한 날짜, 통계) 캐시
+
+    # ---------- DataStore 변경 알림 ----------
+    def on_change(self, kind, frame):
+        with self._lock:
+            if kind == "reset": self._rows, self._groups, self._stats = {}, {}, {}
+            keys = zip(*(frame[k].map(norm_key) for k in self.keys)) if len(self.keys) > 1 else frame[self.keys[0]].map(norm_key)
+            for rid, key, f, e, d in zip(frame.index.tolist(), keys, frame["최종혜택가"].tolist(), frame["체감가"].tolist(), frame["_시작일"].tolist()):
+                old = self._rows.pop(rid, None)
+                if old is not None:
+                    grp = self._groups[old]
+                    del grp[rid]
+                    if not grp: del self._groups[old]
+                    self._stats.pop(old, None)
+                if kind == "delete": continue
+                self._rows[rid] = key
+                self._groups.setdefault(key, {})[rid] = (int(f), int(e), d)
+                self._stats.pop(key, None)
+
+    # ---------- 조회 ----------
+    def get(self, *key):
+        # 키가 없으면 None. min_felt 는 0 보다 큰 체감가 중 최저 (없으면 min_final)
+        key = tuple(norm_key(k) for k in key) if len(self.keys) > 1 else norm_key(key[0])
+        today = pd.Timestamp.today().normalize()
+        with self._lock:
+            hit = self._stats.get(key)
+            if hit is not None and hit[0] == today: return hit[1]
+            grp = self._groups.get(key)
+            if not grp: return None
+            stats = self._compute(grp.values(), today)
+            self._stats[key] = (today, stats)
+            return stats
+
+    def lookup(self, df, field="min_final"):
+        # df 의 각 행이 속한 키의 통계값 (검색 결과의 '역대 최저' 배지용)
+        keys = zip(*(df[k].tolist() for k in self.keys))
+        return pd.Series([(self.get(*k) or {}).get(field) for k in keys], index=df.index, dtype="float64")
+
+    def _compute(self, rows, today):
+        rows = list(rows)
+        since = today - pd.Timedelta(days=self.window_days)
+        finals = [f for f, e, d in rows]
+        felts = [e for f, e, d in rows if e > 0]
+        dates = [d for f, e, d in rows if not pd.isna(d)]
+        recent = [(f, e) for f, e, d in rows if not pd.isna(d) and d >= since]
+        recent_felts = [e for f, e in recent if e > 0]
+        return {
+            "count": len(rows),
+            "min_final": min(finals),
+            "min_felt": min(felts) if felts else min(finals),
+            "last_seen": max(dates) if dates else None,
+            "recent_count": len(recent),
+            "recent_min_final": min(f for f, e in recent) if recent else None,
+            "recent_min_felt": min(recent_felts) if recent_felts else None,
+        }
+
+
+class SortIndex:
+    # 정렬 컬럼별로 (값, 행 id) 순서를 미리 유지해 두는 인덱스 (행사 시작일, 최종혜택가).
+    # 값이 없는 행(NaT 등)은 방향과 관계없이 항상 맨 뒤에 둔다 (sort_values 의 na_position="last" 와 동일).
+
+    def __init__(self, columns=("_시작일", "최종혜택가")):
+        self.columns = tuple(columns)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._orders = {c: [] for c in self.columns}  # 정렬된 [(값, 행 id)] (load() 직후에는 None, 첫 변경 때 만든다)
+        self._values = {c: {} for c in self.columns}  # 행 id -> 값 (없으면 None)
+        self._missing = {c: set() for c in self.columns}
+        self._arrays = {}  # 컬럼 -> 정렬된 행 id numpy 캐시
+        self._loaded = {}  # 컬럼 -> load() 한 정렬된 값 배열 (_orders 를 늦게 만들 때 사용)
+
+    @staticmethod
+    def _value(v):
+        if v is None or pd.isna(v): return None
+        return v.value if isinstance(v, pd.Timestamp) else v
+
+    # ---------- DataStore 변경 알림 ----------
+    def on_change(self, kind, frame):
+        with self._lock:
+            ids = frame.index.tolist()
+            if kind == "reset":
+                self._reset()
+                for c in self.columns:
+                    vals = [self._value(v) for v in frame[c].tolist()]
+                    self._values[c] = dict(zip(ids, vals))
+                    self._missing[c] = {rid for rid, v in zip(ids, vals) if v is None}
+                    self._orders[c] = sorted((v, rid) for rid, v in zip(ids, vals) if v is not None)
+                return
+            for c in self.columns:
+                order, values, missing = self._order_list(c), self._values[c], self._missing[c]
+                new = frame[c].tolist() if kind != "delete" else [None] * len(ids)
+                for rid, v in zip(ids, new):
+                    if rid in values:
+                        old = values.pop(rid)
+                        if old is None: missing.discard(rid)
+                        else: del order[bisect.bisect_left(order, (old, rid))]
+                    if kind == "delete": continue
+                    v = values[rid] = self._value(v)
+                    if v is None: missing.add(rid)
+                    else: bisect.insort(order, (v, rid))
+                self._arrays.pop(c, None)
+
+    def _order_list(self, c):
+        if self._orders[c] is None:
+            self._orders[c] = list(zip(self._loaded.pop(c).tolist(), self._arrays[c].tolist()))
+        return self._orders[c]
+
+    # ---------- 스냅샷 (조회 엔진 워커가 mmap 으로 공유) ----------
+    def arrays(self):
+        # 컬럼 순번 i 별 정렬된 행 id / 값, 값 없는 행 id
+        with self._lock:
+            out = {}
+            for i, c in enumerate(self.columns):
+                order = self._order_list(c)
+                out[f"{i}.ids"] = np.array([rid for _, rid in order], dtype="int64")
+                out[f"{i}.values"] = np.array([v for v, _ in order]) if order else np.array([], dtype="int64")
+                out[f"{i}.missing"] = np.array(sorted(self._missing[c]), dtype="int64")
+            return out
+
+    def load(self, arrays):
+        # arrays() 결과(읽기 전용 mmap 이어도 됨)로 정렬 순서를 되살린다 (다시 정렬하지 않음)
+        with self._lock:
+            self._reset()
+            for i, c in enumerate(self.columns):
+                ids, vals, missing = arrays[f"{i}.ids"], arrays[f"{i}.values"], arrays[f"{i}.missing"].tolist()
+                self._arrays[c], self._loaded[c], self._orders[c] = ids, vals, None
+                self._values[c] = dict(zip(ids.tolist(), vals.tolist()))
+                self._values[c].update(dict.fromkeys(missing))
+                self._missing[c] = set(missing)
+        return self
+
+    # ---------- 조회 ----------
+    def order(self, column, ids=None, ascending=True):
+        # ids(없으면 전체)를 column 기준으로 정렬한 행 id 배열
+        with self._lock:
+            arr = self._arrays.get(column)
+            if arr is None: arr = self._arrays[column] = np.array([rid for _, rid in self._order_list(column)], dtype="int64")
+            missing, values = self._missing[column], self._values[column]
+            if ids is None:
+                head, tail = arr, sorted(missing)
+            elif len(ids) * 8 >= len(arr):
+                # 결과가 크면 미리 정렬된 전체 순서에서 골라낸다
+                ids = np.asarray(ids, dtype="int64")
+                head, tail = arr[np.isin(arr, ids)], sorted(set(ids.tolist()) & missing)
+            else:
+                # 결과가 작으면 해당 행 값만 정렬
+                present = [rid for rid in ids if values.get(rid) is not None]
+                keys = [values[rid] for rid in present]
+                head = np.array(present, dtype="int64")[np.lexsort((present, keys))] if present else np.array([], dtype="int64")
+                tail = sorted(rid for rid in ids if rid in missing)
+            if not ascending: head = head[::-1]
+            return np.concatenate([head, np.array(tail, dtype="int64")])
+
+
+def gather(df, ids, column):
+    # 결과 행 전체를 DataFrame 으로 만들지 않고 한 컬럼 값만 모은다
+    pos = df.index.get_indexer(ids)
+    return df[column].to_numpy()[pos[pos >= 0]]
+
+
+def summarize(df, ids, value="최종혜택가", by="플랫폼"):
+    # 결과 행의 by 별 건수/최저/중앙값
+    stats = pd.Series(gather(df, ids, value)).groupby(gather(df, ids, by)).agg(["count", "min", "median"])
+    return stats.rename(columns={"count": "건수", "min": "최저", "median": "중앙값"}).rename_axis(by).reset_index()
+
+
+def search_deals(index, sort_index, query="", platform=None, column="_시작일", ascending=False):
+    # 포털 검색 흐름: 검색어/플랫폼 조건에 맞는 행 id 를 column 기준으로 정렬해 돌려준다
+    return sort_index.order(column, index.search(query, platform), ascending)
+
+
+def page_ids(ids, size, page):
+    # 1부터 시작하는 page 번째 size 개 행 id
+    return ids[(page - 1) * size:page * size]
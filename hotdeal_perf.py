@@ -0,0 +1,68 @@
+# rerun 단위 단계별 소요 시간 계측 - 관리자 화면 패널 / 로그 (logger "hotdeal.perf")
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger("hotdeal.perf")
+
+HISTORY = 500  # 단계별로 보관하는 최근 측정 횟수
+
+
+class StageTimer:
+    # 한 번의 rerun 안에서 with timer("검색"): ... 으로 단계별 시간을 잰다.
+    # 단계가 끝날 때마다 공유 TimingLog 에도 바로 기록한다 (st.rerun() 으로 중단되는 저장/등록 단계 포함)
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.stages = []  # (단계, 초)
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def __call__(self, stage):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t
+            self.stages.append((stage, dt))
+            if self.sink is not None: self.sink.add(stage, dt)
+
+    def elapsed(self):
+        return time.perf_counter() - self._t0
+
+    def frame(self):
+        # 이번 rerun 의 단계별 시간표 (같은 단계를 여러 번 지나면 합산)
+        df = pd.DataFrame(self.stages, columns=["단계", "초"]).groupby("단계", sort=False)["초"].sum()
+        return pd.DataFrame({"단계": df.index, "ms": (df.to_numpy() * 1000).round(1)})
+
+    def finish(self):
+        total = self.elapsed()
+        if self.sink is not None: self.sink.add("rerun 전체", total)
+        log.info("rerun %.1fms | %s", total * 1000, ", ".join(f"{s} {dt * 1000:.1f}ms" for s, dt in self.stages))
+        return total
+
+
+class TimingLog:
+    # 프로세스 전체에서 공유하는 단계별 최근 측정값 -> 건수/평균/p50/p95/최대 (ms)
+
+    def __init__(self, history=HISTORY):
+        self.history = history
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.history)).append(seconds)
+
+    def summary(self):
+        with self._lock:
+            items = [(s, np.array(v) * 1000) for s, v in self._samples.items()]
+        rows = [{"단계": s, "건수": len(v), "평균": v.mean(), "p50": np.percentile(v, 50), "p95": np.percentile(v, 95), "최대": v.max()} for s, v in items]
+        out = pd.DataFrame(rows, columns=["단계", "건수", "평균", "p50", "p95", "최대"])
+        return out.sort_values("p95", ascending=False).round(1).reset_index(drop=True)
@@ -0,0 +1,109 @@
+# MD 가격 시뮬레이터 판정 로직 - 단건(get_judgment) / 일괄(simulate_plan) 공용, 과거 기록 매칭(match_history)도 공용
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from hotdeal_index import take
+from hotdeal_store import decode_text, parse_price
+
+# (기준가 대비 배수 상한, 문구, 수준) - 위에서부터 처음 만족하는 구간으로 판정
+JUDGMENTS = [
+    (1.0, "🔥 핫딜 무조건 진행해보죠!", "success"),  # 과거 최저보다 낮음 (미만)
+    (1.1, "👍 핫딜 해볼까요? (10% 내외)", "info"),
+    (1.2, "🤔 핫딜 조금 어렵지 않을까요? (20% 내외)", "warning"),
+]
+JUDGMENT_OVER = ("❌ 핫딜 안될 거 같아요!", "error")
+NO_HISTORY = "과거 데이터 없음"
+
+PLAN_COLS = ["제품명", "예상 최종혜택가", "예상 체감가"]
+# 계획 표 헤더로 인정하는 다른 컬럼명 -> PLAN_COLS
+PLAN_ALIASES = {"상품명": "제품명", "제품": "제품명", "모델명": "제품명", "표준모델명": "제품명",
+                "최종혜택가": "예상 최종혜택가", "혜택가": "예상 최종혜택가", "예상 혜택가": "예상 최종혜택가", "체감가": "예상 체감가"}
+MATCH_CUTOFF = 0.6  # 정확/부분 일치하는 모델명이 없을 때 유사 모델로 인정하는 최소 유사도
+# 단건/일괄 시뮬레이터 공용 과거 기록 매칭 순서 (매칭방식 컬럼 값과 설명)
+MATCH_RULES = {"정확": "표준모델명 일치", "부분": "모델명/제품명에 포함된 과거 행의 최저가", "유사": f"유사도 {MATCH_CUTOFF} 이상 최상위 모델", "없음": "과거 기록 없음"}
+
+
+def get_judgment(current, historic):
+    if current <= 0: return None
+    if current < historic: return JUDGMENTS[0][1:]
+    for ratio, msg, level in JUDGMENTS[1:]:
+        if current <= historic * ratio: return (msg, level)
+    return JUDGMENT_OVER
+
+
+def match_history(name, db, aggregate, index, matcher, cutoff=MATCH_CUTOFF):
+    # 단건/일괄 공용 과거 기록 매칭 -> (매칭모델명, 매칭방식, 기록). 기록이 없으면 ("", "없음", None)
+    # 정확: 표준모델명 집계 / 부분: 모델명·제품명이 name 을 포함하는 과거 행의 최저가 (체감가가 없으면 최종혜택가로 대신)
+    # 유사: 유사도 cutoff 이상인 최상위 모델의 집계
+    hist = aggregate.get(name)
+    if hist is not None: return name, "정확", hist
+    rows = take(db, index.search(name, fields=("표준모델명", "제품명"))) if name.strip() else db.iloc[:0]
+    if not rows.empty:
+        pos_e = rows.loc[rows["체감가"] > 0, "체감가"]
+        models = rows["표준모델명"].unique()
+        label = models[0] if len(models) == 1 else f"{name} 포함 {len(models)}개 모델"
+        return label, "부분", {"min_final": int(rows["최종혜택가"].min()), "min_felt": int(pos_e.min()) if not pos_e.empty else int(rows["최종혜택가"].min())}
+    hit = matcher.close_matches(name, n=1, cutoff=cutoff)
+    hist = aggregate.get(hit[0]) if hit else None
+    return (hit[0], "유사", hist) if hist is not None else ("", "없음", None)
+
+
+def judge_series(current, historic):
+    # get_judgment 의 벡터 버전. 입력가가 0 이하이면 "", 과거 기록이 없으면 NO_HISTORY
+    cur, hist = current.to_numpy(dtype="float64"), historic.to_numpy(dtype="float64")
+    conds = [cur <= 0, np.isnan(hist), cur < hist] + [cur <= hist * r for r, _, _ in JUDGMENTS[1:]]
+    choices = ["", NO_HISTORY] + [msg for _, msg, _ in JUDGMENTS]
+    return pd.Series(np.select(conds, choices, default=JUDGMENT_OVER[0]), index=current.index)
+
+
+def read_plan(data):
+    # 업로드한 CSV(bytes) 또는 붙여넣은 표(str, 탭/쉼표 구분)를 (제품명, 예상 최종혜택가, 예상 체감가) 로 읽는다.
+    # 첫 행에 PLAN_COLS / PLAN_ALIASES 의 컬럼명이 있으면 헤더로 본다. 헤더에 제품명과 예상 최종혜택가가 있으면 이름으로,
+    # 아니면 앞의 세 컬럼을 순서대로 사용한다. CSV 는 utf-8 이 아니면 cp949 로 읽는다.
+    if isinstance(data, bytes): data = decode_text(data)
+    sep = "\t" if "\t" in data.split("\n", 1)[0] else None  # 엑셀 붙여넣기는 탭 구분 (금액의 쉼표와 구분)
+    df = pd.read_csv(io.StringIO(data), sep=sep, engine="python", dtype=str, header=None)
+    if df.shape[1] < 2: raise ValueError("제품명, 예상 최종혜택가, 예상 체감가 순서의 표가 필요합니다.")
+    first = [PLAN_ALIASES.get(c, c) for c in df.iloc[0].fillna("").astype(str).str.strip()]
+    if any(c in PLAN_COLS for c in first): df = df.iloc[1:]
+    if {"제품명", "예상 최종혜택가"} <= set(first):
+        df = df.set_axis(first, axis=1).loc[:, ~pd.Index(first).duplicated()]
+    else:
+        df = df.iloc[:, :3].set_axis(PLAN_COLS[:min(3, df.shape[1])], axis=1)
+    plan = pd.DataFrame({"제품명": df["제품명"].fillna("").astype(str).str.strip()})
+    for c in PLAN_COLS[1:]:
+        plan[c] = parse_price(df[c].fillna("")) if c in df.columns else 0
+    return plan[plan["제품명"] != ""].reset_index(drop=True)
+
+
+def match_models(names, aggregate, matcher, cutoff=MATCH_CUTOFF):
+    # 피드 일괄 등록의 표준모델명 정규화용: 제품명 -> (매칭모델명, 매칭방식). 같은 이름은 한 번만 매칭하고,
+    # 정확 일치가 없을 때만 유사도 검색 (가격 판정용 과거 기록 매칭은 match_history)
+    out = {}
+    for name in dict.fromkeys(names):
+        if aggregate.get(name) is not None: out[name] = (name, "정확")
+        else:
+            hit = matcher.close_matches(name, n=1, cutoff=cutoff)
+            out[name] = (hit[0], "유사") if hit else ("", "없음")
+    pairs = [out[n] for n in names]
+    return [p[0] for p in pairs], [p[1] for p in pairs]
+
+
+def simulate_plan(plan, db, aggregate, index, matcher, chunk_size=1000):
+    # 행사 계획 표를 chunk_size 행씩 판정해 (처리한 행 수, 해당 구간 결과) 를 차례로 돌려준다.
+    # 제품명마다 단건 시뮬레이터와 같은 match_history 규칙으로 과거 기록을 찾는다 (같은 이름은 한 번만)
+    found = {}
+    for start in range(0, len(plan), chunk_size):
+        part = plan.iloc[start:start + chunk_size].copy()
+        for name in pd.unique(part["제품명"]):
+            if name not in found: found[name] = match_history(name, db, aggregate, index, matcher)
+        res = [found[n] for n in part["제품명"]]
+        part["매칭모델명"], part["매칭방식"] = [r[0] for r in res], [r[1] for r in res]
+        part["과거 최종최저"] = pd.Series([(r[2] or {}).get("min_final") for r in res], index=part.index, dtype="float64")
+        part["과거 체감최저"] = pd.Series([(r[2] or {}).get("min_felt") for r in res], index=part.index, dtype="float64")
+        part["최종혜택가 판단"] = judge_series(part["예상 최종혜택가"], part["과거 최종최저"])
+        part["체감가 판단"] = judge_series(part["예상 체감가"], part["과거 체감최저"])
+        yield min(start + chunk_size, len(plan)), part
@@ -0,0 +1,620 @@
+# 핫딜 데이터 저장소 - 저장 백엔드(SQLite WAL 기본 / CSV) + 버전 기준 공유 캐시 + 증분 로드
+# Streamlit 재실행마다 전체 데이터를 다시 읽지 않도록 프로세스 단위로 DataFrame 을 보관하고,
+# 백엔드 버전이 실제로 바뀐 경우에만 (가능하면 바뀐 행만) 다시 읽는다.
+
+import argparse
+import codecs
+import io
+import itertools
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+import pandas as pd
+
+MASTER_COLS = ["선택", "등록날짜", "카테고리", "플랫폼", "행사일정", "브랜드", "제품명", "정상가", "최종혜택가", "체감가", "사은품", "표준모델명"]
+NOTICE_COLS = ["선택", "날짜", "유형", "제목", "내용"]
+
+PRICE_COLS = ["정상가", "최종혜택가", "체감가"]  # 메모리/파일 모두 정수(원)로 보관, 화면 표시 때만 "1,234원" 형식으로 변환
+DATE_COLS = ["_시작일", "_종료일"]  # 행사일정에서 파싱한 파생 컬럼 ('_' 로 시작하는 컬럼은 파일에 저장하지 않음)
+
+DERIVED_COLS = {"표준모델명": "제품명"}  # 예전 파일에 없던 컬럼을 추가할 때 값을 가져올 컬럼 (없으면 빈 값)
+TAIL_BYTES = 64  # 추가(append) 판별용으로 기억해 두는 파일 끝 바이트 수
+SQLITE_NAME = "hotdeal.sqlite3"
+
+
+def extract_num(val):
+    try:
+        if pd.isna(val) or val == "" or val is None: return 0.0
+        if isinstance(val, (int, float)): return float(val)
+        clean_val = "".join(filter(lambda x: x.isdigit() or x == '.', str(val)))
+        return float(clean_val) if clean_val else 0.0
+    except: return 0.0
+
+
+def parse_number(s):
+    # extract_num 의 벡터 버전: 숫자와 '.' 만 남겨 실수로 변환, 해석 불가/빈 값은 0
+    if pd.api.types.is_numeric_dtype(s):
+        return pd.to_numeric(s, errors="coerce").fillna(0).astype("float64")
+    clean = s.astype(str).str.replace(r"[^0-9.]", "", regex=True)
+    return pd.to_numeric(clean, errors="coerce").fillna(0).astype("float64")
+
+
+def parse_price(s):
+    return parse_number(s).astype("int64")
+
+
+def parse_event_dates(s):
+    # "2026-02-12 ~ 2026-02-14" -> (시작일, 종료일). 단일 날짜면 종료일 = 시작일
+    parts = s.astype(str).str.split(" ~ ", n=1)
+    start = pd.to_datetime(parts.str[0], errors="coerce", format="%Y-%m-%d").astype("datetime64[ns]")
+    end = pd.to_datetime(parts.str[1], errors="coerce", format="%Y-%m-%d").astype("datetime64[ns]")
+    return start, end.fillna(start)
+
+
+def text_encoding(f):
+    # 업로드한 텍스트 파일의 인코딩: 끝까지 utf-8 로 읽히면 utf-8-sig, 아니면 cp949 (한글 엑셀의 CSV 기본 저장 형식).
+    # 1MB 씩 증분 디코딩만 하고 읽은 위치는 되돌린다
+    dec, pos = codecs.getincrementaldecoder("utf-8")(), f.tell()
+    try:
+        for block in iter(lambda: f.read(1 << 20), b""): dec.decode(block)
+        dec.decode(b"", final=True)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp949"
+    finally:
+        f.seek(pos)
+
+
+def decode_text(data):
+    # bytes 용 text_encoding
+    try: return data.decode("utf-8-sig")
+    except UnicodeDecodeError: return data.decode("cp949")
+
+
+def format_won(s):
+    return s.map("{:,}원".format)
+
+
+def format_korean_unit(num):
+    num = int(num)
+    if num == 0: return "0원"
+    if num >= 100000000:
+        return f"{num//100000000}억 {(num%100000000)//10000}만 {num%10000:,}원"
+    if num >= 10000:
+        return f"{num//10000}만 {num%10000:,}원"
+    return f"{num:,}원"
+
+
+def display_frame(df):
+    # 화면 표시용 복사본: 가격 컬럼만 문자열로 변환
+    out = df.copy()
+    for c in PRICE_COLS:
+        if c in out.columns: out[c] = format_won(out[c])
+    return out
+
+
+def file_columns(df):
+    return [c for c in df.columns if not str(c).startswith("_")]
+
+
+def normalize_frame(df, is_master):
+    df = df.fillna("")
+    if "선택" not in df.columns: df.insert(0, "선택", False)
+    df["선택"] = df["선택"].astype(bool)
+    if is_master:
+        for c, src in DERIVED_COLS.items():
+            if c not in df.columns: df[c] = df[src] if src in df.columns else ""
+        for c in PRICE_COLS:
+            df[c] = parse_price(df[c]) if c in df.columns else 0
+        df["_시작일"], df["_종료일"] = parse_event_dates(df["행사일정"] if "행사일정" in df.columns else pd.Series("", index=df.index))
+    return df
+
+
+def _records(df, cols):
+    out = df.reindex(columns=cols).astype(object)
+    out = out.where(out.notna(), None)
+    return [tuple(v.item() if hasattr(v, "item") else v for v in row) for row in out.itertuples(index=False)]
+
+
+def _apply_changes(df, upserts, deleted):
+    # 메모리 프레임에 행 단위 변경 반영 (원본은 건드리지 않고 새 프레임 반환).
+    # 기존 행 수정은 값이 바뀐 컬럼만 복사해 위치로 대입, 삭제는 불리언 마스크, 새 id 는 끝에 붙인다
+    # (전체 정렬은 새 id 가 기존 id 사이에 끼는 경우만)
+    if not len(df): return upserts.drop(index=upserts.index.intersection(deleted))
+    pos = df.index.get_indexer(upserts.index)
+    hit = pos >= 0
+    if hit.any() and not (list(upserts.columns) == list(df.columns) and (upserts.dtypes == df.dtypes).all()):
+        base = df.drop(index=df.index.intersection(upserts.index.union(deleted)))
+        return pd.concat([base, upserts]).sort_index()
+    out = df
+    if hit.any():
+        out, rows = df.copy(deep=False), upserts[hit]
+        for c in df.columns:
+            if df[c].iloc[pos[hit]].reset_index(drop=True).equals(rows[c].reset_index(drop=True)): continue
+            col = df[c].copy()
+            col.iloc[pos[hit]] = rows[c].to_numpy()
+            out[c] = col
+    if len(deleted): out = out[~out.index.isin(deleted)]
+    new = upserts[(pos < 0) & ~upserts.index.isin(deleted)]
+    if not len(new): return out
+    out = pd.concat([out, new])
+    return out if new.index.min() > df.index.max() else out.sort_index()
+
+
+class CsvBackend:
+    # CSV 파일 백엔드. 버전 토큰은 (mtime_ns, size), 행 id 는 프로세스 안에서만 유지된다.
+    # 추가는 파일 끝에 덧붙이고, 수정/삭제는 파일 전체를 다시 쓴다.
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)  # 파일이 있으면 파일 헤더, 없으면 기본 컬럼
+        self._default = list(columns)
+        self._tail = b""
+        self._next_id = 0
+
+    def load(self):
+        stat = self._file_stat()
+        if stat is None:
+            self.columns, self._tail, self._next_id = list(self._default), b"", 0
+            return pd.DataFrame(columns=self.columns), None
+        df = pd.read_csv(self.path)
+        self.columns, self._tail, self._next_id = list(df.columns), self._read_tail(stat[1]), len(df)
+        return df, stat
+
+    def changes(self, token):
+        # None: 변경 없음 / "reset": 전체 재로드 필요 / (추가된 행, 삭제 id, 새 토큰)
+        stat = self._file_stat()
+        if stat == token: return None
+        if stat is None or token is None or not self._can_append(token[1], stat[1]): return "reset"
+        with open(self.path, "rb") as f:
+            f.seek(token[1])
+            chunk = f.read(stat[1] - token[1])
+        try:
+            added = pd.read_csv(io.BytesIO(chunk), header=None, names=self.columns, encoding="utf-8")
+        except (pd.errors.ParserError, ValueError, UnicodeDecodeError):
+            return "reset"
+        added.index = self._take_ids(len(added))
+        self._tail = self._read_tail(stat[1])
+        return added, [], stat
+
+    def insert(self, rows, token):
+        before = self._file_stat()
+        new_file = before is None
+        buf = io.StringIO()
+        rows[self.columns].to_csv(buf, header=new_file, index=False)
+        with open(self.path, "wb" if new_file else "ab") as f:
+            if not new_file and self._tail and not self._tail.endswith(b"\n"): f.write(b"\n")
+            f.write(buf.getvalue().encode("utf-8-sig" if new_file else "utf-8"))
+        stat = self._file_stat()
+        self._tail = self._read_tail(stat[1])
+        return self._take_ids(len(rows)), stat if before == token else token
+
+    def insert_chunks(self, chunks):
+        # 청크들을 임시 파일에 모두 쓴 뒤 한 번에 덧붙인다 (도중에 실패하면 원본 파일은 그대로). 추가한 행 수를 돌려준다.
+        # 행 id 는 다음 changes() 에서 덧붙은 구간을 읽으며 부여된다.
+        new_file, n = self._file_stat() is None, 0
+        with tempfile.TemporaryFile() as tmp:
+            for rows in chunks:
+                buf = io.StringIO()
+                rows[self.columns].to_csv(buf, header=new_file and not tmp.tell(), index=False)
+                tmp.write(buf.getvalue().encode("utf-8-sig" if new_file and not tmp.tell() else "utf-8"))
+                n += len(rows)
+            if not n: return 0
+            tmp.seek(0)
+            with open(self.path, "wb" if new_file else "ab") as f:
+                if not new_file and self._tail and not self._tail.endswith(b"\n"): f.write(b"\n")
+                shutil.copyfileobj(tmp, f)
+        return n
+
+    def add_columns(self, cols):
+        # 파일 헤더에 컬럼을 덧붙여 파일 전체를 다시 쓴다 (기존 행은 DERIVED_COLS 원본 값 또는 빈 값)
+        if self._file_stat() is not None:
+            df = pd.read_csv(self.path)
+            for c in cols:
+                if c not in df.columns: df[c] = df[DERIVED_COLS[c]] if DERIVED_COLS.get(c) in df.columns else ""
+            df.to_csv(self.path, index=False, encoding="utf-8-sig")
+            self._tail = self._read_tail(self._file_stat()[1])
+        self.columns += [c for c in cols if c not in self.columns]
+
+    def write(self, frame, upserts, deleted, token, check=False):
+        # check: token 이후 파일이 바뀌었으면 쓰지 않고 ConflictError (행 id 가 프로세스 안에서만 유효해 행 단위로는 가릴 수 없다)
+        if check and self._file_stat() != token: raise ConflictError(upserts.index.union(deleted))
+        self.columns = file_columns(frame)
+        frame[self.columns].to_csv(self.path, index=False, encoding="utf-8-sig")
+        stat = self._file_stat()
+        self._tail = self._read_tail(stat[1])
+        self._next_id = max(self._next_id, int(frame.index.max()) + 1 if len(frame) else 0)
+        return stat
+
+    def _take_ids(self, n):
+        ids = pd.RangeIndex(self._next_id, self._next_id + n)
+        self._next_id += n
+        return ids
+
+    def _file_stat(self):
+        try:
+            st_ = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st_.st_mtime_ns, st_.st_size)
+
+    def _read_tail(self, size):
+        with open(self.path, "rb") as f:
+            f.seek(max(0, size - TAIL_BYTES))
+            return f.read(min(size, TAIL_BYTES))
+
+    def _can_append(self, old_size, size):
+        if size <= old_size or not self._tail.endswith(b"\n"): return False
+        with open(self.path, "rb") as f:
+            f.seek(old_size - len(self._tail))
+            return f.read(len(self._tail)) == self._tail
+
+
+class SqliteBackend:
+    # SQLite(WAL) 백엔드. 행 id 는 rid(INTEGER PRIMARY KEY) 로 영구 유지된다.
+    # 쓰기마다 meta 의 테이블 버전을 1 올리고 바뀐 행의 _ver 에 기록, 삭제는 <테이블>_deleted 에 남겨
+    # 다른 프로세스의 변경도 "_ver > 내 버전" 조회만으로 증분 반영할 수 있게 한다.
+
+    def __init__(self, path, table, columns):
+        self.path = path
+        self.table = table
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+                cols = "".join(f', "{c}"' for c in columns)
+                conn.execute(f'CREATE TABLE "{table}" (rid INTEGER PRIMARY KEY AUTOINCREMENT, _ver INTEGER NOT NULL{cols})')
+                conn.execute(f'CREATE INDEX "{table}_ver" ON "{table}" (_ver)')
+                conn.execute(f'CREATE TABLE "{table}_deleted" (rid INTEGER PRIMARY KEY, _ver INTEGER NOT NULL)')
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, 0)", (table,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.columns = self._table_columns(conn)
+        self.add_columns(columns)
+
+    def _table_columns(self, conn):
+        return [r[1] for r in conn.execute(f'PRAGMA table_info("{self.table}")') if r[1] not in ("rid", "_ver")]
+
+    def add_columns(self, cols):
+        # 없는 컬럼을 ALTER TABLE 로 추가 (기존 행은 DERIVED_COLS 원본 값 또는 NULL). 행 _ver/테이블 버전은 그대로 둔다
+        if all(c in self.columns for c in cols): return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            have = self._table_columns(conn)
+            for c in cols:
+                if c in have: continue
+                conn.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{c}"')
+                if DERIVED_COLS.get(c) in have: conn.execute(f'UPDATE "{self.table}" SET "{c}" = "{DERIVED_COLS[c]}"')
+                have.append(c)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.columns = have
+
+    def _conn(self):
+        # sqlite3 연결은 스레드 간 공유할 수 없으므로 스레드별로 하나씩 연다
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _version(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE key = ?", (self.table,)).fetchone()[0]
+
+    def _read(self, conn, where="", args=()):
+        df = pd.read_sql_query(f'SELECT * FROM "{self.table}" {where} ORDER BY rid', conn, params=args, index_col="rid")
+        df.index.name = None
+        return df.drop(columns="_ver")
+
+    def load(self):
+        conn = self._conn()
+        conn.execute("BEGIN")  # 읽기 트랜잭션 안에서 버전과 행을 같은 스냅샷으로 읽는다
+        try:
+            return self._read(conn), self._version(conn)
+        finally:
+            conn.execute("COMMIT")
+
+    def changes(self, token):
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            ver = self._version(conn)
+            if ver == token: return None
+            if token is None or ver < token: return "reset"
+            deleted = [r[0] for r in conn.execute(f'SELECT rid FROM "{self.table}_deleted" WHERE _ver > ?', (token,))]
+            return self._read(conn, "WHERE _ver > ?", (token,)), deleted, ver
+        finally:
+            conn.execute("COMMIT")
+
+    def _write(self, token, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self._version(conn)
+            ver = before + 1
+            out = fn(conn, ver)
+            conn.execute("UPDATE meta SET value = ? WHERE key = ?", (ver, self.table))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        # 그사이 다른 프로세스가 쓴 변경이 있으면 토큰을 그대로 둬서 다음 refresh 때 함께 받아온다
+        return out, ver if before == token else token
+
+    def _insert(self, conn, ver, rows):
+        cols = "".join(f', "{c}"' for c in self.columns)
+        sql = f'INSERT INTO "{self.table}" (_ver{cols}) VALUES (?{", ?" * len(self.columns)})'
+        return pd.Index([conn.execute(sql, (ver,) + rec).lastrowid for rec in _records(rows, self.columns)])
+
+    def insert(self, rows, token):
+        return self._write(token, lambda conn, ver: self._insert(conn, ver, rows))
+
+    def insert_chunks(self, chunks):
+        # 청크들을 한 트랜잭션으로 추가 (청크마다 executemany, 도중에 실패하면 전부 되돌림). 추가한 행 수를 돌려준다.
+        # 행 id 는 다음 changes() 에서 새 버전의 행을 읽으며 받아온다.
+        cols = "".join(f', "{c}"' for c in self.columns)
+        sql = f'INSERT INTO "{self.table}" (_ver{cols}) VALUES (?{", ?" * len(self.columns)})'
+        def run(conn, ver):
+            n = 0
+            for rows in chunks:
+                conn.executemany(sql, [(ver,) + rec for rec in _records(rows, self.columns)])
+                n += len(rows)
+            return n
+        return self._write(None, run)[0]
+
+    def pending(self):
+        # 테이블이 한 번도 쓰인 적 없음 (버전 0) -> CSV 가져오기 대상
+        return self._version(self._conn()) == 0
+
+    def migrate(self, rows):
+        # 버전이 0 일 때만 rows 를 넣는다. 버전 확인/삽입/버전 증가가 한 트랜잭션이라 도중에 실패하면
+        # 버전 0 그대로 남아 다음 시작(또는 migrate 명령) 때 다시 가져오고, 동시에 시작한 프로세스는 한 번만 넣는다.
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._version(conn) != 0:
+                conn.execute("ROLLBACK")
+                return None
+            ids = self._insert(conn, 1, rows)
+            conn.execute("UPDATE meta SET value = 1 WHERE key = ?", (self.table,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(ids)
+
+    def write(self, frame, upserts, deleted, token, check=False):
+        # check: token 이후 다른 곳에서 수정/삭제한 행을 덮어쓰게 되면 같은 트랜잭션 안에서 ConflictError 로 되돌린다
+        # (이미 지워진 행을 다시 지우는 것은 허용)
+        cols = "".join(f', "{c}"' for c in self.columns)
+        sql = f'INSERT OR REPLACE INTO "{self.table}" (rid, _ver{cols}) VALUES (?, ?{", ?" * len(self.columns)})'
+        def run(conn, ver):
+            if check and ver - 1 != token:
+                newer = pd.Index([r[0] for r in conn.execute(f'SELECT rid FROM "{self.table}" WHERE _ver > ?', (token,))])
+                gone = pd.Index([r[0] for r in conn.execute(f'SELECT rid FROM "{self.table}_deleted" WHERE _ver > ?', (token,))])
+                conflicts = upserts.index.union(deleted).intersection(newer).union(upserts.index.intersection(gone))
+                if len(conflicts): raise ConflictError(conflicts)
+            ids = [int(i) for i in upserts.index]
+            conn.executemany(sql, [(rid, ver) + rec for rid, rec in zip(ids, _records(upserts, self.columns))])
+            conn.executemany(f'DELETE FROM "{self.table}_deleted" WHERE rid = ?', [(rid,) for rid in ids])
+            conn.executemany(f'DELETE FROM "{self.table}" WHERE rid = ?', [(int(rid),) for rid in deleted])
+            conn.executemany(f'INSERT OR REPLACE INTO "{self.table}_deleted" VALUES (?, ?)', [(int(rid), ver) for rid in deleted])
+        return self._write(token, run)[1]
+
+
+class ConflictError(ValueError):
+    # 편집 시작 이후 다른 곳에서 바뀐 행을 덮어쓰려 할 때. ids: 충돌한 행 id
+    def __init__(self, ids):
+        self.ids = pd.Index(ids)
+        super().__init__(f"다른 곳에서 먼저 수정/삭제된 행이 {len(self.ids)}건 있어 저장하지 않았습니다.")
+
+
+def _changed_ids(a, b):
+    # 같은 행 id 를 가진 두 프레임에서 값이 다른 행 id
+    return a.index[(a.astype(str) != b.astype(str)).any(axis=1).to_numpy()]
+
+
+class DataStore:
+    # 하나의 테이블(또는 CSV 파일)을 담당하는 공유 캐시.
+    # snapshot() 이 돌려주는 DataFrame 은 읽기 전용으로 취급한다 (변경 시 항상 새 프레임으로 교체).
+    # 변경 알림: subscribe(fn) -> fn(kind, frame), kind 는 "reset"(전체 교체) / "upsert"(행 추가·수정) / "delete"(삭제된 행)
+    # 행 id 는 DataFrame 인덱스 값이며 편집/삭제 후에도 유지된다 (SQLite 백엔드는 재시작 후에도 유지).
+
+    def __init__(self, backend, is_master):
+        self.backend = backend
+        self.is_master = is_master
+        self.version = 0  # 메모리 데이터가 바뀔 때마다 증가하는 쓰기 카운터
+        self._lock = threading.RLock()
+        self._df = None
+        self._token = None  # 마지막으로 반영한 백엔드 버전
+        self._listeners = []
+
+    # ---------- 조회 ----------
+    def snapshot(self):
+        with self._lock:
+            self.refresh()
+            return self._df
+
+    def state(self):
+        # (현재 프레임, 백엔드 버전 토큰) - 조회 엔진 스냅샷용
+        with self._lock:
+            self.refresh()
+            return self._df, self._token
+
+    def seed(self, frame, token, built=()):
+        # 다른 프로세스가 state() 로 저장해 둔 프레임으로 시작하고 token 이후 변경분만 따라잡는다.
+        # built: 같은 프레임으로 이미 만들어 둔 인덱스의 on_change - "reset" 없이 구독해 이후 변경분만 받는다.
+        # 행 id 가 프로세스 밖에서도 유지되는 SQLite 백엔드에서만 의미가 있다.
+        with self._lock:
+            self._token = token
+            self._set_frame(frame)
+            self._emit("reset", self._df)
+            self._listeners.extend(built)
+            self.refresh()
+
+    def subscribe(self, fn):
+        with self._lock:
+            self._listeners.append(fn)
+            if self._df is not None: fn("reset", self._df)
+
+    def refresh(self):
+        with self._lock:
+            ch = "reset" if self._df is None else self.backend.changes(self._token)
+            if ch is None: return False
+            if ch == "reset":
+                df, self._token = self.backend.load()
+                self._set_frame(normalize_frame(df, self.is_master))
+                self._emit("reset", self._df)
+                return True
+            upserts, deleted, self._token = ch
+            self._apply(normalize_frame(upserts, self.is_master), pd.Index(deleted))
+            return True
+
+    # ---------- 쓰기 ----------
+    def append(self, rows):
+        # 새 행 추가 (전체 재작성 없음). 부여된 행 id 를 돌려준다.
+        with self._lock:
+            self._add_columns(rows)
+            cols = self.backend.columns
+            added = normalize_frame(rows.reindex(columns=cols), self.is_master)
+            ids, self._token = self.backend.insert(added[cols], self._token)
+            added.index = ids
+            self._apply(added, pd.Index([]))
+            return ids
+
+    def append_chunks(self, chunks):
+        # 여러 청크를 한 번의 쓰기로 추가 (SQLite 는 한 트랜잭션, CSV 는 임시 파일에 모아 한 번에 덧붙임).
+        # 청크는 차례로 받아 쓰므로 전체를 메모리에 올리지 않는다. 추가한 행 수를 돌려준다.
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if first is None: return 0
+        with self._lock:
+            self._add_columns(first)
+            cols = self.backend.columns
+            n = self.backend.insert_chunks(normalize_frame(rows.reindex(columns=cols), self.is_master)[cols] for rows in itertools.chain([first], chunks))
+            self.refresh()  # 새 행은 (행 id 와 함께) 증분 변경으로 받아온다
+            return n
+
+    def update(self, rows):
+        # rows: 행 id 를 인덱스로 가진 전체 컬럼 행
+        self._commit(normalize_frame(rows.copy(), self.is_master), pd.Index([]))
+
+    def delete(self, ids):
+        self._commit(pd.DataFrame(), pd.Index(ids))
+
+    def save_edits(self, base, edited, deleted=(), base_version=None):
+        # 편집기 결과 저장. base: 편집을 시작한 시점의 행, edited: 같은 행 id 의 편집 결과, deleted: 삭제할 행 id.
+        # base 와 달라진 행만 수정하고, base_version 이후 다른 곳에서 같은 행이 바뀌었거나 지워졌으면
+        # 아무것도 저장하지 않고 ConflictError 를 낸다. (수정 건수, 삭제 건수) 를 돌려준다.
+        with self._lock:
+            self.refresh()
+            cols = file_columns(base)
+            if not edited.index.is_unique or not edited.index.isin(base.index).all() or file_columns(edited) != cols:
+                raise ValueError("행 id 가 중복되었거나 컬럼 구성이 달라 저장할 수 없습니다.")
+            deleted = pd.Index(deleted).intersection(base.index)
+            edited = normalize_frame(edited.drop(index=deleted, errors="ignore").copy(), self.is_master)
+            changed = _changed_ids(base.loc[edited.index, cols], edited[cols])
+            if base_version is not None and base_version != self.version:
+                cur = self._df
+                alive = changed.union(deleted).intersection(cur.index)
+                # 수정하려던 행이 이미 지워졌거나, 수정/삭제하려던 행이 편집 시작 이후 바뀐 경우 (이미 지워진 행 삭제는 허용)
+                conflicts = changed.difference(cur.index).union(_changed_ids(base.loc[alive, cols], cur.loc[alive, cols]))
+                if len(conflicts): raise ConflictError(conflicts)
+            deleted = deleted.intersection(self._df.index)
+            self._commit(edited.loc[changed], deleted, check=True)
+            return len(changed), len(deleted)
+
+    def export_csv(self, path=None):
+        # 현재 데이터를 기존 CSV 형식(utf-8-sig)으로 내보낸다. path 가 없으면 bytes 반환
+        df = self.snapshot()
+        df = df[file_columns(df)]
+        if path is None: return df.to_csv(index=False).encode("utf-8-sig")
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+
+    # ---------- 내부 ----------
+    def _commit(self, upserts, deleted, check=False):
+        # check: 호출한 쪽이 방금 읽은 상태로 충돌을 확인했으므로 다시 읽지 않고, 그 뒤에 끼어든 변경은
+        # 백엔드가 쓰기 시점에 확인한다 (SQLite 는 쓰기 트랜잭션 안에서)
+        with self._lock:
+            if not check: self.refresh()
+            deleted = self._df.index.intersection(deleted)
+            if not len(upserts) and not len(deleted): return
+            frame = _apply_changes(self._df, upserts, deleted)
+            self._token = self.backend.write(frame, upserts, deleted, self._token, check)
+            self._apply(upserts, deleted, frame)
+
+    def _add_columns(self, rows):
+        self.refresh()
+        missing = [c for c in file_columns(rows) if c not in self.backend.columns]
+        if missing:
+            # 저장소에 없던 컬럼은 추가하고, 메모리 프레임도 새 컬럼 구성으로 다시 읽는다
+            self.backend.add_columns(missing)
+            self._df = None
+            self.refresh()
+
+    def _apply(self, upserts, deleted, frame=None):
+        old = self._df
+        self._set_frame(_apply_changes(old, upserts, deleted) if frame is None else frame)
+        gone = old.index.intersection(deleted)
+        if len(gone): self._emit("delete", old.loc[gone])
+        if len(upserts): self._emit("upsert", upserts)
+
+    def _set_frame(self, df):
+        self._df = df
+        self.version += 1
+
+    def _emit(self, kind, frame):
+        for fn in self._listeners: fn(kind, frame)
+
+
+def open_store(csv_path, columns, backend=None, sqlite_path=None):
+    # backend: "sqlite"(기본) / "csv". 환경변수 HOTDEAL_BACKEND 로도 지정할 수 있다.
+    # SQLite 테이블에 아직 아무것도 쓰이지 않았으면 같은 이름의 CSV 를 옮겨 온다 (성공할 때까지 시작 때마다 재시도).
+    kind = backend or os.environ.get("HOTDEAL_BACKEND", "sqlite")
+    is_master = "master" in os.path.basename(csv_path)
+    if kind == "csv": return DataStore(CsvBackend(csv_path, columns), is_master)
+    if kind != "sqlite": raise ValueError(f"알 수 없는 저장 백엔드: {kind}")
+    sqlite_path = sqlite_path or os.path.join(os.path.dirname(os.path.abspath(csv_path)), SQLITE_NAME)
+    if os.path.exists(csv_path):
+        # CSV 헤더 순서를 따르되 기본 컬럼 중 CSV 에 없는 것(예: 표준모델명)도 테이블에 둔다
+        header = list(pd.read_csv(csv_path, nrows=0).columns)
+        columns = header + [c for c in columns if c not in header]
+    be = SqliteBackend(sqlite_path, os.path.splitext(os.path.basename(csv_path))[0], columns)
+    if os.path.exists(csv_path) and be.pending(): migrate_csv(csv_path, be, is_master)
+    return DataStore(be, is_master)
+
+
+def migrate_csv(csv_path, backend, is_master):
+    # 옮긴 행 수, 이미 다른 곳에서 옮겨졌으면 None
+    df = normalize_frame(pd.read_csv(csv_path), is_master)
+    return backend.migrate(df[file_columns(df)])
+
+
+if __name__ == "__main__":
+    # python hotdeal_store.py export <csv경로> [--out 파일]  : SQLite -> CSV 내보내기
+    # python hotdeal_store.py migrate <csv경로>              : CSV -> SQLite 가져오기 (테이블이 아직 비어 있을 때만)
+    ap = argparse.ArgumentParser(description="핫딜 DB 저장소 마이그레이션/내보내기")
+    ap.add_argument("action", choices=["migrate", "export"])
+    ap.add_argument("csv")
+    ap.add_argument("--out")
+    ap.add_argument("--sqlite")
+    a = ap.parse_args()
+    cols = MASTER_COLS if "master" in os.path.basename(a.csv) else NOTICE_COLS
+    if a.action == "migrate":
+        store = open_store(a.csv, cols, "sqlite", a.sqlite)
+        print(f"{len(store.snapshot())}건이 SQLite 에 있습니다.")
+    else:
+        open_store(a.csv, cols, "sqlite", a.sqlite).export_csv(a.out or a.csv)
+        print(f"{a.out or a.csv} 로 내보냈습니다.")
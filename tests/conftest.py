@@ -0,0 +1,5 @@
+# 저장소 루트의 hotdeal_*.py 모듈을 바로 import 할 수 있도록 경로 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,130 @@
+# 조회 엔진 HTTP/JSON API (serve_in_thread) - 검색/시뮬레이션/일괄 판정/오류 응답, 워커 스냅샷
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hotdeal_bench import generate_rows, write_csv
+from hotdeal_engine import Engine, EngineClient, serve_in_thread, write_snapshot, read_snapshot
+from hotdeal_sim import match_history
+from hotdeal_store import open_store, file_columns, MASTER_COLS
+
+
+@pytest.fixture(scope="module")
+def served(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("engine") / "hotdeal_master_db.csv")
+    write_csv(generate_rows(1000, seed=2), path)
+    store = open_store(path, MASTER_COLS, "sqlite")
+    engine = Engine(store)
+    url, stop = serve_in_thread(engine)
+    yield path, store, engine, url
+    stop()
+
+
+def _get(url, path, **params):
+    # (상태 코드, JSON 응답)
+    req = urllib.request.Request(url + path + "?" + urllib.parse.urlencode(params))
+    return _send(req)
+
+
+def _post(url, path, body):
+    data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+    return _send(urllib.request.Request(url + path, data=data, headers={"Content-Type": "application/json"}))
+
+
+def _send(req):
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r: return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_search(served):
+    path, store, engine, url = served
+    db = store.snapshot()
+    q = db["브랜드"].iloc[0]
+    status, res = _get(url, "/search", q=q, sort="price", order="asc", size=20)
+    hit = db[db[["브랜드", "제품명", "표준모델명"]].apply(lambda c: c.str.lower().str.contains(q.lower(), regex=False)).any(axis=1)]
+    assert status == 200 and res["total"] == len(hit) and res["size"] == 20
+    prices = [r["최종혜택가"] for r in res["rows"]]
+    assert prices == sorted(prices) and res["min_final"] == hit["최종혜택가"].min()
+    assert sum(s["건수"] for s in res["summary"]) == len(hit)
+    status, res = _get(url, "/search", platform=db["플랫폼"].iloc[0], page=999)
+    assert status == 200 and res["page"] == 1 and res["total"] == (db["플랫폼"] == db["플랫폼"].iloc[0]).sum()
+
+
+def test_simulate(served):
+    path, store, engine, url = served
+    model = store.snapshot()["표준모델명"].iloc[0]
+    status, res = _get(url, "/simulate", name=model, final="1,000원", felt=0)
+    assert status == 200 and res["method"] == "정확" and res["model"] == model
+    assert res["history"]["min_final"] == engine.aggregate.get(model)["min_final"]
+    assert res["final"][1] == "success" and res["felt"] is None
+    status, res = _get(url, "/simulate", name="전혀 없는 상품명 ZZ-0000")
+    assert status == 200 and res["history"] is None and res["method"] == "없음"
+
+
+def test_batch_uses_single_item_policy(served):
+    path, store, engine, url = served
+    db = store.snapshot()
+    names = [db["표준모델명"].iloc[0], db["표준모델명"].iloc[1][:-2], db["표준모델명"].iloc[2].replace(" ", ""), "전혀 없는 상품명 ZZ-0000"]
+    status, res = _post(url, "/simulate/batch", {"rows": [{"제품명": n, "예상 최종혜택가": "10,000", "예상 체감가": 0} for n in names]})
+    assert status == 200 and len(res["rows"]) == len(names)
+    for name, row in zip(names, res["rows"]):
+        model, method, hist = match_history(name, db, engine.aggregate, engine.index, engine.matcher)
+        assert (row["매칭모델명"], row["매칭방식"]) == (model, method)
+        assert row["과거 최종최저"] == (hist["min_final"] if hist else None)
+    assert res["rows"][-1]["최종혜택가 판단"] == "과거 데이터 없음"
+
+
+def test_errors(served):
+    path, store, engine, url = served
+    assert _get(url, "/search", sort="name")[0] == 400
+    assert _get(url, "/search", page="첫")[0] == 400
+    assert _post(url, "/simulate/batch", {"rows": "x"})[0] == 400
+    assert _post(url, "/simulate/batch", b"[1, 2]")[0] == 400
+    assert _post(url, "/simulate/batch", b"{")[0] == 400
+    assert _get(url, "/lows", model="전혀 없는 상품명 ZZ-0000")[0] == 404
+    assert _get(url, "/nothing")[0] == 404
+    assert _post(url, "/health", {})[0] == 405
+
+
+def test_client_sees_other_process_writes(served):
+    path, store, engine, url = served
+    client = EngineClient(url)
+    assert client.lows("전혀 없는 상품명 ZZ-0000") is None
+    new = generate_rows(1, seed=9)
+    new["표준모델명"] = new["제품명"] = "엔진 테스트 신규 모델"
+    open_store(path, MASTER_COLS, "sqlite").append(new[file_columns(new)])
+    assert client.search("엔진 테스트 신규")["total"] == 1
+    assert client.lows("엔진 테스트 신규 모델")["min_final"] == new["최종혜택가"].iloc[0]
+    with pytest.raises(ValueError):
+        client.search(sort="name")
+
+
+def test_worker_snapshot_indexes(served, tmp_path):
+    # 워커처럼 스냅샷의 mmap 인덱스로 시작한 엔진이 새로 만든 엔진과 같은 결과를 내는지
+    path, store, engine, url = served
+    write_snapshot(store, str(tmp_path))
+    df, token, index, sort_index = read_snapshot(str(tmp_path))
+    assert isinstance(index._post, np.memmap) and isinstance(sort_index._arrays["최종혜택가"], np.memmap)
+    other = open_store(path, MASTER_COLS, "sqlite")
+    cur = other.snapshot()
+    edited = cur.iloc[[3, 10]].copy()
+    edited["제품명"], edited["최종혜택가"] = "스냅샷 이후 수정", 1
+    other.update(edited)
+    other.delete(cur.index[[20, 21]])
+    worker_store = open_store(path, MASTER_COLS, "sqlite")
+    worker = Engine(worker_store, index=index, sort_index=sort_index)
+    worker_store.seed(df, token, (index.on_change, sort_index.on_change))
+    fresh = Engine(open_store(path, MASTER_COLS, "sqlite"))
+    for q in ["", "스냅샷 이후", cur["브랜드"].iloc[0]]:
+        for sort in ["date", "price"]:
+            a, b = worker.search(q, None, sort, "asc", 1, 100), fresh.search(q, None, sort, "asc", 1, 100)
+            assert a["total"] == b["total"]
+            pd.testing.assert_frame_equal(a["rows"].reset_index(drop=True), b["rows"].reset_index(drop=True))
+    assert worker.platforms() == fresh.platforms()
@@ -0,0 +1,118 @@
+# 피드 일괄 등록: 컬럼 정리 / 할인 계산 / 중복 제거를 직접 만든 피드로 확인
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import hotdeal_import
+from hotdeal_bench import generate_rows
+from hotdeal_import import BRAND_DICT, BrandNormalizer, FeedSpool, final_price, prepare_chunk, prepare_feed, read_feed, unregistered
+from hotdeal_index import PriceAggregate, FuzzyMatcher
+from hotdeal_store import normalize_frame
+
+DEFAULTS = {"플랫폼": "쿠팡", "카테고리": "생활/리빙", "행사일정": "2024-01-01 ~ 2024-01-01", "등록날짜": "2024-01-01"}
+FRIDGE = "삼성전자 비스포크 냉장고 RF85C"
+
+
+def _indexes(db):
+    agg, fm = PriceAggregate(), FuzzyMatcher()
+    agg.on_change("reset", db); fm.on_change("reset", db)
+    return agg, fm
+
+
+@pytest.fixture
+def db():
+    df = generate_rows(3, seed=0)
+    df["플랫폼"], df["행사일정"] = "쿠팡", "2024-05-01 ~ 2024-05-07"
+    df.loc[0, ["제품명", "표준모델명"]] = FRIDGE
+    return normalize_frame(df, True)
+
+
+def _feed(db, rows):
+    agg, fm = _indexes(db)
+    chunks = [(pd.DataFrame(rows, dtype=str), 1.0)]
+    out = list(prepare_feed(chunks, db, BRAND_DICT, agg, fm, DEFAULTS))
+    return pd.concat([r for _, _, r, _ in out]), sum(s for *_, s in out)
+
+
+def test_similar_models_are_not_duplicates(db):
+    # 유사 매칭된 다른 제품은 같은 플랫폼/일정이어도 신규 행이다
+    rows, skipped = _feed(db, {"제품명": ["삼성전자 비스포크 냉장고 RF84C", "삼성전자 비스포크 김치냉장고 RQ33", FRIDGE],
+                               "정상가": ["1000000"] * 3, "행사일정": ["2024-05-01 ~ 2024-05-07"] * 3})
+    assert rows["제품명"].tolist() == ["삼성전자 비스포크 냉장고 RF84C", "삼성전자 비스포크 김치냉장고 RQ33"]
+    assert skipped == 1
+    assert rows["_매칭방식"].iloc[0] == "유사" and rows["표준모델명"].iloc[0] == FRIDGE
+
+
+def test_rows_registered_after_validation_are_dropped(db):
+    rows, _ = _feed(db, {"제품명": ["신규 상품 A", "신규 상품 B"], "정상가": ["1000", "2000"]})
+    now = pd.concat([db, rows.iloc[:1].drop(columns=["_매칭방식", "_식별모델"])], ignore_index=True)
+    assert [r["제품명"].tolist() for r in unregistered([rows], now)] == [["신규 상품 B"]]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "cp949"])
+def test_read_feed_encodings(encoding):
+    data = "상품명,판매가\n삼성 냉장고,1000\n엘지 세탁기,2000\n".encode(encoding)
+    chunks = list(read_feed(io.BytesIO(data), "feed.csv", chunk_rows=1))
+    assert pd.concat([c for c, _ in chunks])["상품명"].tolist() == ["삼성 냉장고", "엘지 세탁기"]
+    assert chunks[-1][1] == 1.0
+
+
+def test_stale_spools_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(hotdeal_import.tempfile, "tempdir", str(tmp_path))
+    old, live = FeedSpool(), FeedSpool()
+    os.utime(old.dir, (0, time.time() - hotdeal_import.SPOOL_TTL - 60))
+    new = FeedSpool()
+    assert not os.path.exists(old.dir) and os.path.isdir(live.dir) and os.path.isdir(new.dir)
+
+
+def _scalar_final(p_v, discounts):
+    # 단건 등록 화면의 예전 계산식
+    ds = [v if unit == "원" else p_v * (v / 100) for v, unit in discounts]
+    return int(p_v - ds[0] - ds[1] - ds[2] - ds[3])
+
+
+def test_final_price_matches_scalar_formula():
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 5_000_000, 500).astype("float64")
+    discounts = [(np.round(rng.uniform(0, 60, 500), rng.integers(0, 3)), rng.choice(["원", "%"], 500)) for _ in range(4)]
+    discounts[0] = (rng.integers(0, 300_000, 500).astype("float64"), discounts[0][1])
+    got = final_price(base, discounts)
+    for i in range(len(base)):
+        row = [(v[i], u[i]) for v, u in discounts]
+        assert got[i] == _scalar_final(base[i], row) == final_price(base[i], row), i
+
+
+def _chunk(rows, db):
+    agg, fm = _indexes(db)
+    return prepare_chunk(pd.DataFrame(rows, dtype=str), BrandNormalizer(BRAND_DICT), agg, fm, DEFAULTS)
+
+
+def test_prepare_chunk_aliases_discounts_and_dates(db):
+    out = _chunk({" 상품명": ["A 상품", "B 상품", "C 상품", "", "E 상품"],
+                  "판매가": ["10,000원", "10000", "20000", "1000", "5000"],
+                  "쿠폰": ["10%", "1000", "10", "", ""], "쿠폰단위": ["", "", "%", "", ""],
+                  "카드": ["500", "5%", "", "", ""], "혜택가": ["1", "", "", "", "4,500원"],
+                  "판매처": ["11번가", "", "", "", ""], "브랜드명": ["삼성 전자", "(주)농심", "모르는 브랜드", "", ""],
+                  "시작일": ["2024-03-01", "", "", "", ""], "종료일": ["2024-03-05", "", "", "", ""],
+                  "행사일정": ["", "2024/04/01 ~ 2024/04/02", "2024-05-01", "", ""]}, db)
+    assert out["제품명"].tolist() == ["A 상품", "B 상품", "C 상품", "E 상품"]
+    assert out["정상가"].tolist() == [10000, 10000, 20000, 5000]
+    assert out["최종혜택가"].tolist() == [8500, 8500, 18000, 4500]  # 할인이 있으면 계산, 없을 때만 혜택가 사용
+    assert out["플랫폼"].tolist() == ["11번가", "쿠팡", "쿠팡", "쿠팡"]
+    assert out["브랜드"].tolist()[:3] == ["삼성전자", "농심", "모르는 브랜드"]
+    assert out["카테고리"].tolist()[:3] == ["디지털/가전", "가공식품", "생활/리빙"]
+    assert out["행사일정"].tolist() == ["2024-03-01 ~ 2024-03-05", "2024-04-01 ~ 2024-04-02", "2024-05-01 ~ 2024-05-01", DEFAULTS["행사일정"]]
+
+
+def test_duplicates_within_feed_and_db(db):
+    dates = ["2024-05-01 ~ 2024-05-07"] * 5
+    rows, skipped = _feed(db, {"제품명": ["새 상품", "새 상품", FRIDGE, "새 상품", "다른 이름"],
+                               "표준모델명": ["", "", "", "", "새 상품"], "정상가": ["1000"] * 5,
+                               "행사일정": dates[:3] + ["2024-06-01", "2024-05-01 ~ 2024-05-07"]})
+    # 같은 피드 안의 중복, 기존 DB 와 같은 제품, 지정한 표준모델명이 앞 행과 같은 경우는 제외 / 일정이 다르면 신규
+    assert rows["제품명"].tolist() == ["새 상품", "새 상품"] and skipped == 3
+    assert rows["행사일정"].tolist() == ["2024-05-01 ~ 2024-05-07", "2024-06-01 ~ 2024-06-01"]
@@ -0,0 +1,132 @@
+# 인덱스 결과를 pandas / difflib 의 기준 구현과 비교
+import random
+from difflib import get_close_matches
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import hotdeal_index
+from hotdeal_bench import generate_rows
+from hotdeal_index import SearchIndex, FuzzyMatcher, PriceAggregate, SEARCH_FIELDS, norm_key
+from hotdeal_store import normalize_frame
+
+
+@pytest.fixture(scope="module")
+def frame():
+    df = generate_rows(2000, seed=1)
+    df.index = np.arange(len(df)) * 3 + 5
+    return df
+
+
+def _expected(df, q, platform=None, fields=None):
+    hit = pd.Series(not q.strip(), index=df.index)
+    for f in (fields or SEARCH_FIELDS) if q.strip() else ():
+        hit |= df[f].astype(str).str.lower().str.contains(q.lower(), regex=False)
+    if platform is not None: hit &= df["플랫폼"] == platform
+    return df.index[hit].to_numpy()
+
+
+def _queries(df, rng, n=200):
+    for _ in range(n):
+        row = df.iloc[rng.randrange(len(df))]
+        text = str(row[rng.choice(SEARCH_FIELDS)])
+        i = rng.randrange(max(len(text), 1))
+        q = text[i:i + rng.randint(1, 6)]
+        yield (q.upper() if rng.random() < 0.2 else q), rng.choice([None, row["플랫폼"], "없는 플랫폼"]), rng.choice([None, ("표준모델명", "제품명")])
+
+
+def test_search_matches_str_contains(frame):
+    idx = SearchIndex()
+    idx.on_change("reset", frame)
+    for q, pf, fields in _queries(frame, random.Random(0)):
+        assert np.array_equal(idx.search(q, pf, fields), _expected(frame, q, pf, fields)), (q, pf, fields)
+    assert np.array_equal(idx.search(""), frame.index.to_numpy())
+    assert idx.platforms() == sorted(frame["플랫폼"].unique())
+
+
+def test_search_after_incremental_changes(frame, monkeypatch):
+    monkeypatch.setattr(hotdeal_index, "DELTA_ROWS", 150)  # 증분 영역 합치기도 함께 확인
+    idx, cur, rng = SearchIndex(), frame.copy(), random.Random(1)
+    idx.on_change("reset", cur)
+    for step in range(6):
+        new = generate_rows(100, seed=10 + step)
+        new.index = np.arange(100) + 100000 + step * 1000
+        edited = cur.sample(40, random_state=step).copy()
+        edited["제품명"] = edited["제품명"] + f" 수정{step}"
+        edited["플랫폼"] = "새 플랫폼"
+        gone = cur.drop(edited.index).sample(30, random_state=step)
+        idx.on_change("upsert", pd.concat([new, edited]))
+        idx.on_change("delete", gone)
+        cur = pd.concat([cur.drop(edited.index), edited, new]).drop(gone.index).sort_index()
+        for q, pf, fields in _queries(cur, rng, 60):
+            assert np.array_equal(idx.search(q, pf, fields), _expected(cur, q, pf, fields)), (step, q, pf, fields)
+        assert idx.platforms() == sorted(cur["플랫폼"].unique())
+
+
+
+def _perturbed(names, rng, n=80):
+    for _ in range(n):
+        name = rng.choice(names)
+        i = rng.randrange(len(name))
+        yield rng.choice([name, name[:i] + name[i + 1:], name.replace(" ", ""), name[i:], name[::-1][:8]])
+
+
+@pytest.mark.parametrize("n, cutoff", [(1, 0.6), (5, 0.2), (3, 0.8)])
+def test_fuzzy_matches_get_close_matches(frame, n, cutoff):
+    fm = FuzzyMatcher()
+    fm.on_change("reset", frame)
+    names = frame["표준모델명"].unique().tolist()
+    for word in _perturbed(names, random.Random(3)):
+        assert fm.close_matches(word, n=n, cutoff=cutoff) == get_close_matches(word, names, n=n, cutoff=cutoff), word
+
+
+def test_fuzzy_after_changes(frame):
+    fm = FuzzyMatcher()
+    fm.on_change("reset", frame)
+    gone = frame[frame["표준모델명"].isin(frame["표준모델명"].unique()[:100])]
+    fm.on_change("delete", gone)
+    new = generate_rows(50, seed=20)
+    new.index = np.arange(50) + 100000
+    fm.on_change("upsert", new)
+    cur = pd.concat([frame.drop(gone.index), new])
+    names = cur["표준모델명"].unique().tolist()
+    for word in _perturbed(frame["표준모델명"].unique().tolist(), random.Random(4)):
+        assert fm.close_matches(word, n=3, cutoff=0.5) == get_close_matches(word, names, n=3, cutoff=0.5), word
+
+
+def _expected_stats(df, keys, window_days=90):
+    since = pd.Timestamp.today().normalize() - pd.Timedelta(days=window_days)
+    felt, recent = df["체감가"].where(df["체감가"] > 0), df["_시작일"] >= since
+    g = pd.DataFrame({"final": df["최종혜택가"], "felt": felt, "date": df["_시작일"], "recent": recent,
+                      "rfinal": df["최종혜택가"].where(recent), "rfelt": felt.where(recent)})
+    g = g.assign(**{f"k{i}": df[k].map(norm_key) for i, k in enumerate(keys)}).groupby([f"k{i}" for i in range(len(keys))])
+    out = g.agg(count=("final", "size"), min_final=("final", "min"), min_felt=("felt", "min"), last_seen=("date", "max"),
+                recent_count=("recent", "sum"), recent_min_final=("rfinal", "min"), recent_min_felt=("rfelt", "min"))
+    out["min_felt"] = out["min_felt"].fillna(out["min_final"])
+    raw = df.assign(**{f"k{i}": df[k].map(norm_key) for i, k in enumerate(keys)}).groupby([f"k{i}" for i in range(len(keys))])[list(keys)].first()
+    return {tuple(raw.loc[k]): {c: (None if pd.isna(v) else v) for c, v in row.items()} for k, row in out.iterrows()}
+
+
+@pytest.mark.parametrize("keys", [("표준모델명",), ("표준모델명", "플랫폼")])
+def test_price_aggregate_matches_groupby(frame, keys):
+    cur = normalize_frame(frame.copy(), True)
+    cur.loc[cur["표준모델명"] == cur["표준모델명"].iloc[0], "체감가"] = 0  # 체감가가 모두 없으면 min_felt = min_final
+    agg = PriceAggregate(keys=keys)
+    agg.on_change("reset", cur)
+    for step in range(4):
+        edited = cur.sample(60, random_state=step).copy()
+        edited["최종혜택가"] = (edited["최종혜택가"] * 0.5).astype("int64")
+        edited["표준모델명"] = edited["표준모델명"].str.upper()  # 대소문자만 다른 모델명은 같은 키
+        new = normalize_frame(generate_rows(80, seed=30 + step), True)
+        new.index = np.arange(80) + 200000 + step * 1000
+        gone = cur.drop(edited.index).sample(50, random_state=step)
+        agg.on_change("upsert", pd.concat([edited, new]))
+        agg.on_change("delete", gone)
+        cur = pd.concat([cur.drop(edited.index), edited, new]).drop(gone.index)
+        expected = _expected_stats(cur, keys)
+        for key, stats in expected.items():
+            assert agg.get(*key) == stats, (step, key)
+        assert agg.get(*(["없는 모델"] * len(keys))) is None
+    stats = list(expected.values())
+    assert any(s["recent_min_final"] is not None for s in stats) and any(s["recent_min_final"] is None for s in stats)
@@ -0,0 +1,16 @@
+# 행사 계획 표 읽기: 헤더 판별 / 구분자 / 인코딩
+import pytest
+
+from hotdeal_sim import read_plan, PLAN_COLS
+
+
+@pytest.mark.parametrize("data", [
+    "버즈 프로\t\t119,000\n버즈\t1000\t100\n",  # 헤더 없음, 첫 행 가격 칸이 빈 값
+    "제품명\t예상 최종혜택가\t예상 체감가\n버즈 프로\t\t119,000\n버즈\t1000\t100\n",
+    "상품명,체감가,혜택가\n버즈 프로,\"119,000\",\n버즈,100,1000\n".encode("cp949"),
+    "모델명,최종혜택가,예상 체감가\n버즈 프로,,119000\n버즈,1000,100\n".encode("utf-8-sig"),
+])
+def test_read_plan(data):
+    plan = read_plan(data)
+    assert list(plan.columns) == PLAN_COLS
+    assert plan.values.tolist() == [["버즈 프로", 0, 119000], ["버즈", 1000, 100]]
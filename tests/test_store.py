@@ -0,0 +1,165 @@
+# DataStore 저장/재시작 왕복, 다른 DataStore 와의 충돌, CSV -> SQLite 가져오기
+import numpy as np
+import pandas as pd
+import pytest
+
+import hotdeal_store
+from hotdeal_bench import generate_rows, write_csv
+from hotdeal_store import open_store, file_columns, normalize_frame, ConflictError, MASTER_COLS
+
+BACKENDS = ["sqlite", "csv"]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / "hotdeal_master_db.csv")
+    write_csv(generate_rows(50, seed=3), path)
+    return path
+
+
+def _open(path, backend):
+    return open_store(path, MASTER_COLS, backend)
+
+
+def _rows(n, seed):
+    df = generate_rows(n, seed=seed)
+    return df[file_columns(df)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip(csv_path, backend):
+    store = _open(csv_path, backend)
+    assert len(store.snapshot()) == 50
+    ids = store.append(_rows(3, 7))
+    edited = store.snapshot().loc[ids[:1]].copy()
+    edited["제품명"] = "수정된 상품"
+    store.update(edited)
+    store.delete(ids[1:2])
+    again = _open(csv_path, backend).snapshot()
+    assert len(again) == 52
+    assert (again["제품명"] == "수정된 상품").sum() == 1
+    assert again["최종혜택가"].dtype == "int64"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_other_store_changes_are_picked_up(csv_path, backend):
+    a, b = _open(csv_path, backend), _open(csv_path, backend)
+    a.snapshot()
+    b.append(_rows(2, 8))
+    b.delete(b.snapshot().index[:1])
+    assert len(a.snapshot()) == len(b.snapshot()) == 51
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_conflicting_edit_is_rejected(csv_path, backend):
+    a, b = _open(csv_path, backend), _open(csv_path, backend)
+    base, ver = a.snapshot().copy(), a.version
+    rid = base.index[0]
+    theirs = b.snapshot().loc[[rid]].copy()
+    theirs["제품명"] = "다른 관리자 수정"
+    b.update(theirs)
+    mine = base.copy()
+    mine.loc[rid, "제품명"] = "내 수정"
+    with pytest.raises(ConflictError):
+        a.save_edits(base, mine, [], ver)
+    assert (_open(csv_path, backend).snapshot()["제품명"] == "다른 관리자 수정").sum() == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_edit_of_row_deleted_elsewhere_is_rejected(csv_path, backend):
+    a, b = _open(csv_path, backend), _open(csv_path, backend)
+    base, ver = a.snapshot().copy(), a.version
+    b.delete(b.snapshot().index[:1])
+    mine = base.copy()
+    mine.loc[base.index[0], "제품명"] = "지워진 행 수정"
+    with pytest.raises(ConflictError):
+        a.save_edits(base, mine, [], ver)
+    after = _open(csv_path, backend).snapshot()
+    assert len(after) == 49 and not (after["제품명"] == "지워진 행 수정").any()
+
+
+def test_delete_racing_the_write_is_not_resurrected(csv_path):
+    # 충돌 확인(메모리) 이후 쓰기 트랜잭션 전에 다른 DataStore 가 같은 행을 지운 경우
+    a, b = _open(csv_path, "sqlite"), _open(csv_path, "sqlite")
+    base, ver = a.snapshot().copy(), a.version
+    rid = base.index[0]
+    b.snapshot()
+    write = a.backend.write
+    def racing(*args, **kw):
+        b.delete([rid])
+        return write(*args, **kw)
+    a.backend.write = racing
+    mine = base.copy()
+    mine.loc[rid, "제품명"] = "내 수정"
+    with pytest.raises(ConflictError):
+        a.save_edits(base, mine, [], ver)
+    assert rid not in _open(csv_path, "sqlite").snapshot().index
+
+
+def test_edit_of_other_rows_is_saved(csv_path):
+    a, b = _open(csv_path, "sqlite"), _open(csv_path, "sqlite")
+    base, ver = a.snapshot().copy(), a.version
+    b.delete(b.snapshot().index[-1:])
+    mine = base.copy()
+    mine.loc[base.index[0], "제품명"] = "내 수정"
+    assert a.save_edits(base, mine, [], ver) == (1, 0)
+    assert len(_open(csv_path, "sqlite").snapshot()) == 49
+
+
+def test_failed_migration_is_retried(csv_path, monkeypatch):
+    def fail(*args): raise RuntimeError("중단")
+    monkeypatch.setattr(hotdeal_store.SqliteBackend, "_insert", fail)
+    with pytest.raises(RuntimeError):
+        _open(csv_path, "sqlite")
+    monkeypatch.undo()
+    assert len(_open(csv_path, "sqlite").snapshot()) == 50
+    assert len(_open(csv_path, "sqlite").snapshot()) == 50
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_csv_without_model_column(tmp_path, backend):
+    path = str(tmp_path / "hotdeal_master_db.csv")
+    write_csv(generate_rows(5, seed=4).drop(columns=["표준모델명"]), path)
+    store = _open(path, backend)
+    assert (store.snapshot()["표준모델명"] == store.snapshot()["제품명"]).all()
+    row = _rows(1, 9)
+    row["표준모델명"] = "신규 모델"
+    store.append(row)
+    again = _open(path, backend).snapshot()
+    assert len(again) == 6 and (again["표준모델명"] == "신규 모델").sum() == 1
+    assert (again["표준모델명"].iloc[:5] == again["제품명"].iloc[:5]).all()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_append_chunks_is_one_write(csv_path, backend):
+    store, other = _open(csv_path, backend), _open(csv_path, backend)
+    other.snapshot()
+    def failing():
+        yield _rows(4, 10)
+        raise RuntimeError("중단")
+    with pytest.raises(RuntimeError):
+        store.append_chunks(failing())
+    assert len(_open(csv_path, backend).snapshot()) == 50
+    assert store.append_chunks([_rows(4, 10), _rows(0, 11), _rows(3, 12)]) == 7
+    assert len(store.snapshot()) == len(other.snapshot()) == 57
+    assert store.snapshot().index.is_unique and store.snapshot()["최종혜택가"].dtype == "int64"
+
+
+def test_apply_changes_matches_drop_and_concat():
+    df = normalize_frame(generate_rows(300, seed=5), True)
+    df.index = df.index * 2
+    for step in range(20):
+        rng = np.random.default_rng(step)
+        edited = df.sample(int(rng.integers(0, 5)), random_state=step).copy()
+        edited["제품명"] = edited["제품명"] + " 수정"
+        edited["최종혜택가"] += 10
+        new = normalize_frame(generate_rows(int(rng.integers(0, 3)), seed=step), True)
+        new.index = rng.choice(np.arange(1, 1000, 2), len(new), replace=False) if step % 2 else np.arange(len(new)) + 10000
+        upserts = pd.concat([edited, new])
+        deleted = pd.Index(rng.choice(df.index, int(rng.integers(0, 4)), replace=False))
+        before = df.copy()
+        got = hotdeal_store._apply_changes(df, upserts, deleted)
+        pd.testing.assert_frame_equal(df, before)
+        expected = pd.concat([df.drop(index=upserts.index.union(deleted), errors="ignore"), upserts.drop(index=deleted, errors="ignore")]).sort_index()
+        pd.testing.assert_frame_equal(got, expected, check_index_type=False)
+        df = got